@@ -0,0 +1,145 @@
+"""normalize irs eins
+
+Revision ID: 584d6ba78e5e
+Revises: f60fac9ff652
+Create Date: 2026-10-17 23:33:16.486384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '584d6ba78e5e'
+down_revision: Union[str, None] = 'f60fac9ff652'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# IRS external_ids rewritten the way indexer.base.normalize_ein writes them:
+# dashes and surrounding spaces dropped, left-padded to nine digits. Organizations
+# whose keys normalize to the same EIN are merged into one survivor (the row
+# already stored under the normalized key, else the most recently updated), and
+# everything pointing at the others is moved onto it before they are deleted.
+NORMALIZE = [
+    """
+    CREATE TEMP TABLE irs_eins ON COMMIT DROP AS
+    SELECT id, external_id, updated_at,
+        CASE WHEN length(digits) < 9 THEN lpad(digits, 9, '0') ELSE digits END AS ein
+    FROM (
+        SELECT id, external_id, updated_at, replace(btrim(external_id), '-', '') AS digits
+        FROM organizations
+        WHERE registry = 'IRS' AND btrim(external_id) <> ''
+    ) AS o
+    """,
+    """
+    CREATE TEMP TABLE ein_merges ON COMMIT DROP AS
+    SELECT id AS old_id, survivor AS new_id
+    FROM (
+        SELECT id, first_value(id) OVER (
+            PARTITION BY ein ORDER BY external_id = ein DESC, updated_at DESC, id
+        ) AS survivor
+        FROM irs_eins
+    ) AS e
+    WHERE id <> survivor
+    """,
+    # Optional fields the survivor lacks are taken from the newest merged row that has them.
+    """
+    UPDATE organizations AS o SET
+        country = COALESCE(NULLIF(o.country, ''), m.country),
+        website = COALESCE(NULLIF(o.website, ''), m.website),
+        city = COALESCE(NULLIF(o.city, ''), m.city),
+        region = COALESCE(NULLIF(o.region, ''), m.region)
+    FROM (
+        SELECT m.new_id,
+            (array_agg(d.country ORDER BY d.updated_at DESC) FILTER (WHERE d.country <> ''))[1] AS country,
+            (array_agg(d.website ORDER BY d.updated_at DESC) FILTER (WHERE d.website <> ''))[1] AS website,
+            (array_agg(d.city ORDER BY d.updated_at DESC) FILTER (WHERE d.city <> ''))[1] AS city,
+            (array_agg(d.region ORDER BY d.updated_at DESC) FILTER (WHERE d.region <> ''))[1] AS region
+        FROM ein_merges AS m JOIN organizations AS d ON d.id = m.old_id
+        GROUP BY m.new_id
+    ) AS m
+    WHERE o.id = m.new_id
+    """,
+    "UPDATE grants SET funder_org_id = m.new_id FROM ein_merges AS m WHERE funder_org_id = m.old_id",
+    "UPDATE grants SET grantee_org_id = m.new_id FROM ein_merges AS m WHERE grantee_org_id = m.old_id",
+    "UPDATE tenants SET linked_org_id = m.new_id FROM ein_merges AS m WHERE linked_org_id = m.old_id",
+    # A tenant can hold one entry per organization: keep the most recently updated
+    # of the merged orgs' entries (the status counter trigger follows the delete).
+    """
+    DELETE FROM funnel_entries AS f
+    USING (
+        SELECT f.id, row_number() OVER (
+            PARTITION BY f.tenant_id, COALESCE(m.new_id, f.org_id) ORDER BY f.updated_at DESC, f.id
+        ) AS rank
+        FROM funnel_entries AS f
+        LEFT JOIN ein_merges AS m ON m.old_id = f.org_id
+        WHERE f.org_id IN (SELECT old_id FROM ein_merges UNION SELECT new_id FROM ein_merges)
+    ) AS d
+    WHERE f.id = d.id AND d.rank > 1
+    """,
+    "UPDATE funnel_entries SET org_id = m.new_id FROM ein_merges AS m WHERE org_id = m.old_id",
+    # Survivors' totals change, and so do their counterparties' distinct counts.
+    """
+    CREATE TEMP TABLE ein_giving_orgs ON COMMIT DROP AS
+    SELECT new_id AS org_id FROM ein_merges
+    UNION SELECT old_id FROM ein_merges
+    UNION SELECT g.grantee_org_id FROM grants AS g JOIN ein_merges AS m ON g.funder_org_id = m.new_id
+    UNION SELECT g.funder_org_id FROM grants AS g JOIN ein_merges AS m ON g.grantee_org_id = m.new_id
+    """,
+    """
+    DELETE FROM giving_pairs
+    WHERE funder_org_id IN (SELECT old_id FROM ein_merges UNION SELECT new_id FROM ein_merges)
+        OR grantee_org_id IN (SELECT old_id FROM ein_merges UNION SELECT new_id FROM ein_merges)
+    """,
+    # As app.services.giving rebuilds the pairs, limited to the survivors'.
+    """
+    INSERT INTO giving_pairs (funder_org_id, grantee_org_id, year, grants)
+    SELECT funder_org_id, grantee_org_id, COALESCE(year, 0), count(*)
+    FROM grants
+    WHERE funder_org_id IN (SELECT new_id FROM ein_merges) OR grantee_org_id IN (SELECT new_id FROM ein_merges)
+    GROUP BY GROUPING SETS ((funder_org_id, grantee_org_id, year), (funder_org_id, grantee_org_id))
+    HAVING NOT (GROUPING(year) = 0 AND year IS NULL)
+    """,
+    "DELETE FROM giving_summaries WHERE org_id IN (SELECT org_id FROM ein_giving_orgs)",
+    # As app.services.giving rebuilds the summaries, limited to the affected orgs.
+    """
+    INSERT INTO giving_summaries
+        (org_id, year, given_amount, given_count, grantees, received_amount, received_count, funders)
+    SELECT
+        org_id,
+        COALESCE(year, 0),
+        COALESCE(sum(amount) FILTER (WHERE given), 0),
+        count(*) FILTER (WHERE given),
+        count(DISTINCT counterpart) FILTER (WHERE given),
+        COALESCE(sum(amount) FILTER (WHERE NOT given), 0),
+        count(*) FILTER (WHERE NOT given),
+        count(DISTINCT counterpart) FILTER (WHERE NOT given)
+    FROM (
+        SELECT funder_org_id AS org_id, grantee_org_id AS counterpart, true AS given, amount, year FROM grants
+        UNION ALL
+        SELECT grantee_org_id, funder_org_id, false, amount, year FROM grants
+    ) AS g
+    WHERE org_id IN (SELECT org_id FROM ein_giving_orgs)
+    GROUP BY GROUPING SETS ((org_id, year), (org_id))
+    HAVING NOT (GROUPING(year) = 0 AND year IS NULL)
+    """,
+    "DELETE FROM organizations WHERE id IN (SELECT old_id FROM ein_merges)",
+    """
+    UPDATE organizations AS o SET external_id = e.ein, updated_at = now()
+    FROM irs_eins AS e
+    WHERE o.id = e.id AND e.external_id <> e.ein
+    """,
+]
+
+
+def upgrade() -> None:
+    for stmt in NORMALIZE:
+        op.execute(stmt)
+
+
+def downgrade() -> None:
+    # Merged organizations cannot be split again; padded keys stay valid for the older code.
+    pass
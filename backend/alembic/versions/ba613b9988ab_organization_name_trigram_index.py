@@ -0,0 +1,29 @@
+"""organization name trigram index
+
+Revision ID: ba613b9988ab
+Revises: 82e4f46de76f
+Create Date: 2026-10-17 21:01:47.633308
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ba613b9988ab'
+down_revision: Union[str, None] = '82e4f46de76f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Built concurrently so indexing a large organizations table does not block writes.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_organizations_name_trgm', 'organizations', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_organizations_name_trgm', table_name='organizations', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
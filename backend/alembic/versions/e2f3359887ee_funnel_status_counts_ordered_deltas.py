@@ -0,0 +1,79 @@
+"""funnel status counts ordered deltas
+
+Revision ID: e2f3359887ee
+Revises: f85f57116ce6
+Create Date: 2026-10-18 09:12:40.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f3359887ee'
+down_revision: Union[str, None] = 'f85f57116ce6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# One upsert of the net change per (tenant_id, status), in key order. Every
+# statement locks counter rows in the same order, so concurrent status moves
+# in one tenant (prospect -> shortlisted and back) cannot deadlock, and
+# updates that keep the status do not touch the counters at all.
+APPLY_FUNCTION = """
+CREATE OR REPLACE FUNCTION funnel_status_counts_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO funnel_status_counts AS c (tenant_id, status, count)
+        SELECT tenant_id, status, count(*) FROM new_rows
+        GROUP BY tenant_id, status ORDER BY tenant_id, status
+        ON CONFLICT (tenant_id, status) DO UPDATE SET count = c.count + excluded.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO funnel_status_counts AS c (tenant_id, status, count)
+        SELECT tenant_id, status, -count(*) FROM old_rows
+        GROUP BY tenant_id, status ORDER BY tenant_id, status
+        ON CONFLICT (tenant_id, status) DO UPDATE SET count = c.count + excluded.count;
+    ELSE
+        INSERT INTO funnel_status_counts AS c (tenant_id, status, count)
+        SELECT tenant_id, status, sum(n) FROM (
+            SELECT tenant_id, status, 1 AS n FROM new_rows
+            UNION ALL
+            SELECT tenant_id, status, -1 FROM old_rows
+        ) AS d
+        GROUP BY tenant_id, status HAVING sum(n) <> 0 ORDER BY tenant_id, status
+        ON CONFLICT (tenant_id, status) DO UPDATE SET count = c.count + excluded.count;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+# As created by ce00e7087c85.
+PREVIOUS_FUNCTION = """
+CREATE OR REPLACE FUNCTION funnel_status_counts_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO funnel_status_counts (tenant_id, status, count)
+        SELECT tenant_id, status, count(*) FROM new_rows GROUP BY tenant_id, status
+        ON CONFLICT (tenant_id, status)
+        DO UPDATE SET count = funnel_status_counts.count + excluded.count;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE funnel_status_counts AS c SET count = c.count - d.n
+        FROM (SELECT tenant_id, status, count(*) AS n FROM old_rows GROUP BY tenant_id, status) AS d
+        WHERE c.tenant_id = d.tenant_id AND c.status = d.status;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    op.execute(APPLY_FUNCTION)
+
+
+def downgrade() -> None:
+    op.execute(PREVIOUS_FUNCTION)
@@ -0,0 +1,30 @@
+"""funnel listing indexes
+
+Revision ID: e628d7123822
+Revises: ce00e7087c85
+Create Date: 2026-10-17 21:10:38.047435
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e628d7123822'
+down_revision: Union[str, None] = 'ce00e7087c85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so large tenants' funnels stay writable meanwhile.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_funnel_entries_tenant_status_updated_at_id', 'funnel_entries', ['tenant_id', 'status', 'updated_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_funnel_entries_org_id', 'funnel_entries', ['org_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_funnel_entries_org_id', table_name='funnel_entries')
+    op.drop_index('ix_funnel_entries_tenant_status_updated_at_id', table_name='funnel_entries')
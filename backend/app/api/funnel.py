@@ -1,16 +1,40 @@
 import uuid
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Boolean, Select, Text, Uuid, any_, cast, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import get_db
+from app.api.export import ExportFormat, export_columns, export_response
+from app.api.pagination import Keyset
+from app.api.serialization import as_dicts, json_response, row_columns
+from app.db import engine, get_db
 from app.models.funnel_entry import FunnelEntry, FunnelStatus
+from app.models.funnel_status_count import FunnelStatusCount
+from app.models.organization import Organization
 from app.models.tenant import Tenant
-from app.schemas.funnel_entry import FunnelEntryCreate, FunnelEntryRead, FunnelEntryUpdate
+from app.schemas.funnel_entry import (
+    FunnelEntryBulkResult,
+    FunnelEntryCreate,
+    FunnelEntryExpanded,
+    FunnelEntryRead,
+    FunnelEntryUpdate,
+    FunnelSummary,
+)
+from app.schemas.organization import OrganizationRead
+from app.services import recommendations
 
 router = APIRouter()
 
+funnel_keyset = Keyset(FunnelEntry.updated_at, FunnelEntry.id, descending=True)
+
+# Label prefix of the organization columns joined in for ``expand=organization``.
+ORG_PREFIX = "organization_"
+
 
 async def _get_tenant(tenant_id: uuid.UUID, db: AsyncSession) -> Tenant:
     tenant = await db.get(Tenant, tenant_id)
@@ -19,21 +43,88 @@ async def _get_tenant(tenant_id: uuid.UUID, db: AsyncSession) -> Tenant:
     return tenant
 
 
-@router.get("", response_model=list[FunnelEntryRead])
+def funnel_listing(
+    tenant_id: uuid.UUID,
+    status: FunnelStatus | None,
+    expand: Literal["organization"] | None,
+    cursor: str | None,
+    offset: int,
+    limit: int,
+) -> Select:
+    """The page query ``list_funnel_entries`` runs; ``benchmarks.funnel_plan`` checks its plans."""
+    stmt = select(*row_columns(FunnelEntry, FunnelEntryRead)).where(FunnelEntry.tenant_id == tenant_id)
+    if status:
+        stmt = stmt.where(FunnelEntry.status == status)
+    if expand == "organization":
+        org_columns = row_columns(Organization, OrganizationRead)
+        stmt = stmt.add_columns(*(column.label(ORG_PREFIX + column.key) for column in org_columns))
+        stmt = stmt.join(Organization, FunnelEntry.org_id == Organization.id)
+    return funnel_keyset.apply(stmt, cursor, offset, limit)
+
+
+@router.get("", response_model=list[FunnelEntryExpanded], response_model_exclude_unset=True)
 async def list_funnel_entries(
     tenant_id: uuid.UUID,
+    response: Response,
     status: FunnelStatus | None = None,
+    expand: Literal["organization"] | None = None,
+    cursor: str | None = None,
     offset: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
     db: AsyncSession = Depends(get_db),
-) -> list[FunnelEntry]:
+) -> Response:
+    """List a tenant's funnel entries.
+
+    ``expand=organization`` inlines each entry's organization, joined in the
+    same query; without it the ``organization`` key is omitted.
+    """
     await _get_tenant(tenant_id, db)
-    stmt = select(FunnelEntry).where(FunnelEntry.tenant_id == tenant_id)
+    stmt = funnel_listing(tenant_id, status, expand, cursor, offset, limit)
+    result = await db.execute(stmt)
+    entries = as_dicts(funnel_keyset.page(list(result.all()), limit, response))
+    if expand == "organization":
+        entries = [_nest_organization(entry) for entry in entries]
+    return json_response(list[FunnelEntryExpanded], entries, response)
+
+
+def _nest_organization(entry: dict) -> dict:
+    organization = {key.removeprefix(ORG_PREFIX): entry.pop(key) for key in list(entry) if key.startswith(ORG_PREFIX)}
+    entry["organization"] = organization
+    return entry
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_funnel_entries(
+    tenant_id: uuid.UUID,
+    status: FunnelStatus | None = None,
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """Stream a tenant's whole funnel as NDJSON or CSV, with each organization's name."""
+    await _get_tenant(tenant_id, db)
+    stmt = (
+        select(*export_columns(FunnelEntry, FunnelEntryRead), Organization.name.label("organization_name"))
+        .join(Organization, FunnelEntry.org_id == Organization.id)
+        .where(FunnelEntry.tenant_id == tenant_id)
+    )
     if status:
         stmt = stmt.where(FunnelEntry.status == status)
-    stmt = stmt.order_by(FunnelEntry.updated_at.desc()).offset(offset).limit(limit)
-    result = await db.execute(stmt)
-    return list(result.scalars().all())
+    return export_response(stmt, fmt, "funnel", engine=engine)
+
+
+@router.get("/summary", response_model=FunnelSummary)
+async def funnel_summary(
+    tenant_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+) -> FunnelSummary:
+    """Entry counts per status, read from the trigger-maintained counter table."""
+    await _get_tenant(tenant_id, db)
+    result = await db.execute(
+        select(FunnelStatusCount.status, FunnelStatusCount.count).where(FunnelStatusCount.tenant_id == tenant_id)
+    )
+    counts = dict.fromkeys(FunnelStatus, 0)
+    counts.update(result.tuples().all())
+    return FunnelSummary(counts=counts, total=sum(counts.values()))
 
 
 @router.post("", response_model=FunnelEntryRead, status_code=201)
@@ -46,23 +137,95 @@ async def create_funnel_entry(
     entry = FunnelEntry(tenant_id=tenant_id, **body.model_dump())
     db.add(entry)
     await db.commit()
+    await recommendations.invalidate(tenant_id)
     await db.refresh(entry)
     return entry
 
 
-@router.post("/bulk", response_model=list[FunnelEntryRead], status_code=201)
+@router.post("/bulk", response_model=FunnelEntryBulkResult, status_code=201)
 async def bulk_create_funnel_entries(
     tenant_id: uuid.UUID,
     body: list[FunnelEntryCreate],
+    on_conflict: Literal["skip", "update"] = "skip",
     db: AsyncSession = Depends(get_db),
-) -> list[FunnelEntry]:
+) -> FunnelEntryBulkResult | Response:
+    """Add many organizations to a tenant's funnel in a single statement.
+
+    Orgs already in the funnel are skipped (``on_conflict=skip``) or have their
+    status overwritten (``on_conflict=update``; entries already at the
+    requested status count as skipped). If an org appears more than once in
+    the body, its last status wins. Unknown org ids fail the whole request
+    with a 422 listing them.
+    """
     await _get_tenant(tenant_id, db)
-    entries = [FunnelEntry(tenant_id=tenant_id, **item.model_dump()) for item in body]
-    db.add_all(entries)
+    statuses = {item.org_id: item.status for item in body}
+    if not statuses:
+        return FunnelEntryBulkResult(created=[], updated=[], skipped=[])
+
+    # Rows travel as three array parameters and are unnested server-side, so the
+    # statement size does not grow with the batch (asyncpg caps bind parameters).
+    # Sorted by org_id, concurrent bulk requests for one tenant take their
+    # unique-index locks in the same order and cannot deadlock on them.
+    ordered = sorted(statuses.items())
+    source = func.unnest(
+        literal([uuid.uuid4() for _ in ordered], ARRAY(Uuid)),
+        literal([org_id for org_id, _ in ordered], ARRAY(Uuid)),
+        literal([status.value for _, status in ordered], ARRAY(Text)),
+    ).table_valued("id", "org_id", "status").render_derived()
+    stmt = pg_insert(FunnelEntry).from_select(
+        ["id", "tenant_id", "org_id", "status"],
+        select(
+            source.c.id,
+            literal(tenant_id, Uuid),
+            source.c.org_id,
+            cast(source.c.status, FunnelEntry.status.type),
+        ),
+    )
+    if on_conflict == "update":
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_funnel_tenant_org",
+            set_={"status": stmt.excluded.status, "updated_at": func.now()},
+            where=FunnelEntry.status != stmt.excluded.status,
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(constraint="uq_funnel_tenant_org")
+    stmt = stmt.returning(
+        *row_columns(FunnelEntry, FunnelEntryRead),
+        # xmax is zero only for tuples created by this statement.
+        literal_column("(xmax = 0)", Boolean).label("inserted"),
+    )
+    try:
+        result = await db.execute(stmt)
+    except IntegrityError:
+        # The only foreign key the statement can violate is org_id; find the
+        # culprits only on this path so the common case stays one statement.
+        await db.rollback()
+        ids = literal(list(statuses), ARRAY(Uuid))
+        found = set((await db.execute(select(Organization.id).where(Organization.id == any_(ids)))).scalars())
+        missing = [org_id for org_id in statuses if org_id not in found]
+        if not missing:
+            raise
+        raise HTTPException(
+            status_code=422, detail={"message": "Organizations not found", "org_ids": [str(i) for i in missing]}
+        )
+    rows = as_dicts(result.all())
     await db.commit()
-    for entry in entries:
-        await db.refresh(entry)
-    return entries
+    await recommendations.invalidate(tenant_id)
+
+    created: list[dict] = []
+    updated: list[dict] = []
+    for row in rows:
+        (created if row.pop("inserted") else updated).append(row)
+    touched = {row["org_id"] for row in rows}
+    return json_response(
+        FunnelEntryBulkResult,
+        {
+            "created": created,
+            "updated": updated,
+            "skipped": [org_id for org_id in statuses if org_id not in touched],
+        },
+        status_code=201,
+    )
 
 
 @router.patch("/{entry_id}", response_model=FunnelEntryRead)
@@ -92,3 +255,4 @@ async def delete_funnel_entry(
         raise HTTPException(status_code=404, detail="Funnel entry not found")
     await db.delete(entry)
     await db.commit()
+    await recommendations.invalidate(tenant_id)
@@ -1,38 +1,68 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import get_db
+from app.api.export import ExportFormat, export_columns, export_response
+from app.api.pagination import Keyset
+from app.api.serialization import as_dicts, row_columns, row_type
+from app.db import get_db, get_read_db, read_engine
 from app.models.grant import Grant
 from app.schemas.grant import GrantCreate, GrantRead
+from app.services.cofunding import cofunding_graph
+from app.services.giving import aapply_giving_deltas
+from app.services.response_cache import response_cache
 
 router = APIRouter()
 
+grant_keyset = Keyset(Grant.created_at, Grant.id, descending=True)
+
 
 @router.get("", response_model=list[GrantRead])
 async def list_grants(
+    request: Request,
     funder_org_id: uuid.UUID | None = None,
     grantee_org_id: uuid.UUID | None = None,
+    cursor: str | None = None,
     offset: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    # Primary, not replica: a lagging replica read right after invalidation would be cached.
     db: AsyncSession = Depends(get_db),
-) -> list[Grant]:
-    stmt = select(Grant)
+) -> Response:
+    async def load(response: Response) -> list[dict]:
+        stmt = select(*row_columns(Grant, GrantRead))
+        if funder_org_id:
+            stmt = stmt.where(Grant.funder_org_id == funder_org_id)
+        if grantee_org_id:
+            stmt = stmt.where(Grant.grantee_org_id == grantee_org_id)
+        stmt = grant_keyset.apply(stmt, cursor, offset, limit)
+        result = await db.execute(stmt)
+        return as_dicts(grant_keyset.page(list(result.all()), limit, response))
+
+    return await response_cache.serve(request, "grants", list[row_type(GrantRead)], load)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_grants(
+    funder_org_id: uuid.UUID | None = None,
+    grantee_org_id: uuid.UUID | None = None,
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+) -> StreamingResponse:
+    """Stream all grants (optionally by funder/grantee) as NDJSON or CSV, without paging."""
+    stmt = select(*export_columns(Grant, GrantRead))
     if funder_org_id:
         stmt = stmt.where(Grant.funder_org_id == funder_org_id)
     if grantee_org_id:
         stmt = stmt.where(Grant.grantee_org_id == grantee_org_id)
-    stmt = stmt.order_by(Grant.created_at.desc()).offset(offset).limit(limit)
-    result = await db.execute(stmt)
-    return list(result.scalars().all())
+    return export_response(stmt, fmt, "grants", engine=read_engine)
 
 
 @router.get("/{grant_id}", response_model=GrantRead)
 async def get_grant(
     grant_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> Grant:
     grant = await db.get(Grant, grant_id)
     if not grant:
@@ -47,7 +77,10 @@ async def create_grant(
 ) -> Grant:
     grant = Grant(**body.model_dump())
     db.add(grant)
+    await db.flush()
+    await aapply_giving_deltas(db, [(grant.funder_org_id, grant.grantee_org_id, grant.amount, grant.year)])
     await db.commit()
+    await response_cache.ainvalidate("grants")
     await db.refresh(grant)
     return grant
 
@@ -61,4 +94,11 @@ async def delete_grant(
     if not grant:
         raise HTTPException(status_code=404, detail="Grant not found")
     await db.delete(grant)
+    await db.flush()
+    await aapply_giving_deltas(
+        db, [(grant.funder_org_id, grant.grantee_org_id, grant.amount, grant.year)], removed=True
+    )
     await db.commit()
+    await response_cache.ainvalidate("grants")
+    # Only additions reach the graph incrementally; a removed pair needs a rebuild.
+    await cofunding_graph.ainvalidate()
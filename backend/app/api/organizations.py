@@ -1,52 +1,231 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import any_, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import get_db
+from app.api.export import ExportFormat, export_columns, export_response
+from app.api.pagination import Keyset
+from app.api.serialization import as_dicts, json_response, row_columns
+from app.db import get_db, get_read_db, read_engine
+from app.models.giving_summary import ALL_YEARS, GivingSummary
 from app.models.organization import Organization
-from app.schemas.organization import OrganizationCreate, OrganizationRead, OrganizationUpdate
+from app.schemas.giving_summary import GivingSummaryRead, GivingTotals, GivingYear
+from app.schemas.organization import (
+    OrganizationBatchByKeyResult,
+    OrganizationBatchGet,
+    OrganizationBatchGetByKey,
+    OrganizationBatchResult,
+    OrganizationCount,
+    OrganizationCreate,
+    OrganizationRead,
+    OrganizationSearchResult,
+    OrganizationSimilarity,
+    OrganizationUpdate,
+)
+from app.services import counts
+from app.services.cofunding import cofunding_graph
+from app.services.response_cache import response_cache
 
 router = APIRouter()
 
+org_keyset = Keyset(Organization.name, Organization.id)
+
 
 @router.get("", response_model=list[OrganizationRead])
 async def list_organizations(
+    response: Response,
     q: str | None = None,
+    cursor: str | None = None,
     offset: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
-    db: AsyncSession = Depends(get_db),
-) -> list[Organization]:
-    stmt = select(Organization)
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    stmt = select(*row_columns(Organization, OrganizationRead))
     if q:
-        stmt = stmt.where(Organization.name.ilike(f"%{q}%"))
-    stmt = stmt.order_by(Organization.name).offset(offset).limit(limit)
+        stmt = stmt.where(counts.search_filter(q))
+    stmt = org_keyset.apply(stmt, cursor, offset, limit)
     result = await db.execute(stmt)
-    return list(result.scalars().all())
+    rows = org_keyset.page(list(result.all()), limit, response)
+    return json_response(list[OrganizationRead], as_dicts(rows), response)
 
 
-@router.get("/count")
+@router.get("/count", response_model=OrganizationCount)
 async def count_organizations(
     q: str | None = None,
-    db: AsyncSession = Depends(get_db),
-) -> dict[str, int]:
-    stmt = select(func.count()).select_from(Organization)
+    exact: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+) -> OrganizationCount:
+    """Count organizations, estimating large counts unless ``exact`` is requested."""
+    count, is_exact = await counts.count_organizations(db, q, exact=exact)
+    return OrganizationCount(count=count, exact=is_exact)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_organizations(
+    q: str | None = None,
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+) -> StreamingResponse:
+    """Stream all organizations (or those matching ``q``) as NDJSON or CSV, without paging."""
+    stmt = select(*export_columns(Organization, OrganizationRead))
     if q:
-        stmt = stmt.where(Organization.name.ilike(f"%{q}%"))
+        stmt = stmt.where(counts.search_filter(q))
+    return export_response(stmt, fmt, "organizations", engine=read_engine)
+
+
+@router.get("/search", response_model=list[OrganizationSearchResult])
+async def search_organizations(
+    q: str = Query(..., min_length=1),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Relevance-ranked name search backed by the pg_trgm index.
+
+    Matches substrings and fuzzy word matches (typos, word order), or name
+    prefixes for one- and two-character queries, ranked by trigram word
+    similarity to ``q``.
+    """
+    score = func.word_similarity(q, Organization.name).label("score")
+    stmt = (
+        select(*row_columns(Organization, OrganizationRead), score)
+        .where(counts.search_filter(q))
+        .order_by(score.desc(), Organization.name)
+        .offset(offset)
+        .limit(limit)
+    )
     result = await db.execute(stmt)
-    return {"count": result.scalar_one()}
+    return json_response(list[OrganizationSearchResult], as_dicts(result.all()))
+
+
+@router.post("/batch-get", response_model=OrganizationBatchResult)
+async def batch_get_organizations(
+    body: OrganizationBatchGet,
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Fetch many organizations by id in one ``id = ANY(...)`` query.
+
+    Results follow the order of ``body.ids`` (duplicates included), with
+    ``None`` in place of ids that do not exist; those ids are also listed in
+    ``missing``.
+    """
+    found: dict[uuid.UUID, dict] = {}
+    if body.ids:
+        ids = literal(list(set(body.ids)), ARRAY(Organization.id.type))
+        stmt = select(*row_columns(Organization, OrganizationRead)).where(Organization.id == any_(ids))
+        result = await db.execute(stmt)
+        found = {org["id"]: org for org in as_dicts(result.all())}
+    return json_response(
+        OrganizationBatchResult,
+        {
+            "organizations": [found.get(org_id) for org_id in body.ids],
+            "missing": [org_id for org_id in body.ids if org_id not in found],
+        },
+    )
+
+
+@router.post("/batch-get-by-key", response_model=OrganizationBatchByKeyResult)
+async def batch_get_organizations_by_key(
+    body: OrganizationBatchGetByKey,
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Fetch many organizations by (registry, external_id) in one query.
+
+    Same ordering and miss semantics as ``/batch-get``.
+    """
+    keys = [(key.registry, key.external_id) for key in body.keys]
+    found: dict[tuple[str, str], dict] = {}
+    if keys:
+        stmt = select(*row_columns(Organization, OrganizationRead)).where(
+            tuple_(Organization.registry, Organization.external_id).in_(set(keys))
+        )
+        result = await db.execute(stmt)
+        found = {(org["registry"], org["external_id"]): org for org in as_dicts(result.all())}
+    return json_response(
+        OrganizationBatchByKeyResult,
+        {
+            "organizations": [found.get(key) for key in keys],
+            "missing": [{"registry": r, "external_id": e} for r, e in keys if (r, e) not in found],
+        },
+    )
 
 
 @router.get("/{org_id}", response_model=OrganizationRead)
 async def get_organization(
     org_id: uuid.UUID,
+    request: Request,
+    # Primary, not replica: a lagging replica read right after invalidation would be cached.
     db: AsyncSession = Depends(get_db),
-) -> Organization:
-    org = await db.get(Organization, org_id)
-    if not org:
+) -> Response:
+    async def load(response: Response) -> Organization:
+        org = await db.get(Organization, org_id)
+        if not org:
+            raise HTTPException(status_code=404, detail="Organization not found")
+        return org
+
+    return await response_cache.serve(request, "organizations", OrganizationRead, load)
+
+
+@router.get("/{org_id}/giving-summary", response_model=GivingSummaryRead)
+async def get_giving_summary(
+    org_id: uuid.UUID,
+    db: AsyncSession = Depends(get_read_db),
+) -> GivingSummaryRead:
+    """Grant totals and yearly breakdown, read from the precomputed ``giving_summaries`` rows."""
+    if not await db.get(Organization, org_id):
         raise HTTPException(status_code=404, detail="Organization not found")
-    return org
+    result = await db.execute(
+        select(GivingSummary).where(GivingSummary.org_id == org_id).order_by(GivingSummary.year.desc())
+    )
+    rows = list(result.scalars())
+    totals = next((row for row in rows if row.year == ALL_YEARS), None)
+    return GivingSummaryRead(
+        org_id=org_id,
+        total=GivingTotals.model_validate(totals) if totals else GivingTotals(),
+        by_year=[GivingYear.model_validate(row) for row in rows if row.year != ALL_YEARS],
+    )
+
+
+@router.get("/{org_id}/similar-grantees", response_model=list[OrganizationSimilarity])
+async def similar_grantees(
+    org_id: uuid.UUID,
+    limit: int = Query(20, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db),
+) -> list[OrganizationSimilarity]:
+    """Organizations funded by the same funders as ``org_id``, from the in-memory co-funding graph."""
+    graph = await cofunding_graph.get()
+    return await _similar(db, org_id, graph.similar_grantees(org_id, limit))
+
+
+@router.get("/{org_id}/similar-funders", response_model=list[OrganizationSimilarity])
+async def similar_funders(
+    org_id: uuid.UUID,
+    limit: int = Query(20, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db),
+) -> list[OrganizationSimilarity]:
+    """Funders whose grantees overlap with those of ``org_id``, from the in-memory co-funding graph."""
+    graph = await cofunding_graph.get()
+    return await _similar(db, org_id, graph.similar_funders(org_id, limit))
+
+
+async def _similar(
+    db: AsyncSession, org_id: uuid.UUID, ranked: list[tuple[uuid.UUID, float]]
+) -> list[OrganizationSimilarity]:
+    """Hydrate graph results in one query, keeping rank order and dropping orgs deleted since the snapshot."""
+    if not ranked and not await db.get(Organization, org_id):
+        raise HTTPException(status_code=404, detail="Organization not found")
+    if not ranked:
+        return []
+    ids = literal([similar_id for similar_id, _ in ranked], ARRAY(Organization.id.type))
+    result = await db.execute(select(Organization).where(Organization.id == any_(ids)))
+    found = {org.id: org for org in result.scalars()}
+    return [
+        OrganizationSimilarity(**OrganizationRead.model_validate(found[similar_id]).model_dump(), score=score)
+        for similar_id, score in ranked
+        if similar_id in found
+    ]
 
 
 @router.post("", response_model=OrganizationRead, status_code=201)
@@ -57,6 +236,7 @@ async def create_organization(
     org = Organization(**body.model_dump())
     db.add(org)
     await db.commit()
+    await response_cache.ainvalidate("organizations")
     await db.refresh(org)
     return org
 
@@ -73,6 +253,7 @@ async def update_organization(
     for field, value in body.model_dump(exclude_unset=True).items():
         setattr(org, field, value)
     await db.commit()
+    await response_cache.ainvalidate("organizations")
     await db.refresh(org)
     return org
 
@@ -87,3 +268,4 @@ async def delete_organization(
         raise HTTPException(status_code=404, detail="Organization not found")
     await db.delete(org)
     await db.commit()
+    await response_cache.ainvalidate("organizations")
@@ -0,0 +1,75 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+Pages are addressed by an opaque cursor encoding the (sort column, id) of the
+last row served, so each page is an index range scan from that point instead
+of skipping ``offset`` rows. The next cursor is returned in the
+``X-Next-Cursor`` response header, which keeps list bodies unchanged for
+clients that still page with ``offset``.
+"""
+
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException, Response
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Keyset:
+    def __init__(self, sort_column: InstrumentedAttribute, id_column: InstrumentedAttribute, descending: bool = False):
+        self.sort_column = sort_column
+        self.id_column = id_column
+        self.descending = descending
+
+    def apply(self, stmt: Select, cursor: str | None, offset: int, limit: int) -> Select:
+        """Order ``stmt`` by the keyset and select one page (plus one row to detect more)."""
+        if self.descending:
+            stmt = stmt.order_by(self.sort_column.desc(), self.id_column.desc())
+        else:
+            stmt = stmt.order_by(self.sort_column, self.id_column)
+        if cursor:
+            sort_value, id_value = self._decode(cursor)
+            key = tuple_(self.sort_column, self.id_column)
+            stmt = stmt.where(key < (sort_value, id_value) if self.descending else key > (sort_value, id_value))
+        else:
+            stmt = stmt.offset(offset)
+        return stmt.limit(limit + 1)
+
+    def page(self, rows: list, limit: int, response: Response) -> list:
+        """Trim the look-ahead row and set the next cursor header when there is one."""
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            response.headers[NEXT_CURSOR_HEADER] = self._encode(
+                getattr(last, self.sort_column.key), getattr(last, self.id_column.key)
+            )
+        return rows
+
+    def _encode(self, sort_value: Any, id_value: uuid.UUID) -> str:
+        if isinstance(sort_value, datetime):
+            sort_value = sort_value.isoformat()
+        raw = json.dumps([sort_value, str(id_value)], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    def _decode(self, cursor: str) -> tuple[Any, uuid.UUID]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            sort_value, id_value = json.loads(raw)
+            # Values reach the SQL comparison, so anything of the wrong type is
+            # rejected here rather than by the database.
+            python_type = self.sort_column.type.python_type
+            if python_type is datetime:
+                sort_value = datetime.fromisoformat(sort_value)
+            elif type(sort_value) is not python_type:
+                raise TypeError(f"cursor sort value must be {python_type.__name__}")
+            if not isinstance(id_value, str):
+                raise TypeError("cursor id must be a string")
+            return sort_value, uuid.UUID(id_value)
+        except (binascii.Error, ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
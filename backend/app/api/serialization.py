@@ -0,0 +1,81 @@
+"""Lean JSON responses for hot read endpoints.
+
+Returning ORM objects makes FastAPI validate every row into the response
+model (``from_attributes``) and then serialize the validated models. The hot
+endpoints instead select the columns the schema needs, so rows skip the ORM
+identity map, and write them with a ``TypeAdapter`` over a ``TypedDict``
+mirror of the schema (``row_type``): pydantic-core serializes the plain dicts
+directly, field by field as the schema would, with no validation pass. The
+JSON is identical to the validated path; ``response_model`` still documents
+the endpoint.
+"""
+
+import types
+from functools import lru_cache
+from typing import Any, Union, get_args, get_origin
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import ColumnElement, Row
+from typing_extensions import TypedDict  # pydantic rejects typing.TypedDict before Python 3.12
+
+from app.models.base import Base
+
+# Headers every Starlette Response sets for its own body.
+_OWN_HEADERS = frozenset({"content-length", "content-type"})
+
+
+def row_columns(model: type[Base], schema: type[BaseModel]) -> list[ColumnElement]:
+    """The table columns of ``model`` named by ``schema``'s fields, in field order."""
+    return [model.__table__.c[name] for name in schema.model_fields if name in model.__table__.c]
+
+
+def _row_annotation(annotation: Any) -> Any:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return row_type(annotation)
+    args = get_args(annotation)
+    if not args:
+        return annotation
+    mapped = tuple(_row_annotation(arg) for arg in args)
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        return Union[mapped]
+    return origin[mapped]
+
+
+@lru_cache
+def row_type(schema: type[BaseModel]) -> type:
+    """A ``TypedDict`` with ``schema``'s fields; nested models become row types too.
+
+    Keys are not required, so an omitted key is left out of the JSON, like an
+    unset field under ``response_model_exclude_unset``.
+    """
+    fields = {name: _row_annotation(field.annotation) for name, field in schema.model_fields.items()}
+    return TypedDict(f"{schema.__name__}Row", fields, total=False)
+
+
+@lru_cache
+def _adapter(annotation: Any) -> TypeAdapter:
+    return TypeAdapter(_row_annotation(annotation))
+
+
+def as_dicts(rows: list[Row]) -> list[dict[str, Any]]:
+    """Plain dicts from column rows, keyed by column label."""
+    return [row._asdict() for row in rows]
+
+
+def dump_json(annotation: Any, content: Any) -> bytes:
+    """``content`` (dicts shaped like ``annotation``) serialized as ``annotation`` would be."""
+    return _adapter(annotation).dump_json(content)
+
+
+def json_response(annotation: Any, content: Any, response: Response | None = None, status_code: int = 200) -> Response:
+    """A JSON response with ``content`` serialized as ``annotation`` (e.g. ``list[OrganizationRead]``).
+
+    FastAPI drops headers set on the injected ``Response`` when an endpoint
+    returns its own, so pass it as ``response`` to carry them over (the next
+    page cursor). ``status_code`` likewise replaces the route's default.
+    """
+    headers = {k: v for k, v in response.headers.items() if k not in _OWN_HEADERS} if response else None
+    body = dump_json(annotation, content)
+    return Response(body, status_code=status_code, media_type="application/json", headers=headers)
@@ -1,22 +1,29 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_db
 from app.models.tenant import Tenant
+from app.schemas.recommendation import Recommendation
 from app.schemas.tenant import TenantCreate, TenantRead
+from app.services import recommendations
+from app.services.response_cache import response_cache
 
 router = APIRouter()
 
 
 @router.get("", response_model=list[TenantRead])
 async def list_tenants(
+    request: Request,
     db: AsyncSession = Depends(get_db),
-) -> list[Tenant]:
-    result = await db.execute(select(Tenant).order_by(Tenant.name))
-    return list(result.scalars().all())
+) -> Response:
+    async def load(response: Response) -> list[Tenant]:
+        result = await db.execute(select(Tenant).order_by(Tenant.name))
+        return list(result.scalars().all())
+
+    return await response_cache.serve(request, "tenants", list[TenantRead], load)
 
 
 @router.get("/{tenant_id}", response_model=TenantRead)
@@ -30,6 +37,19 @@ async def get_tenant(
     return tenant
 
 
+@router.get("/{tenant_id}/recommendations", response_model=list[Recommendation])
+async def get_recommendations(
+    tenant_id: uuid.UUID,
+    limit: int = Query(50, ge=1, le=recommendations.MAX_RECOMMENDATIONS),
+    db: AsyncSession = Depends(get_db),
+) -> list[Recommendation]:
+    """Prospects ranked by shared funders, geography and grant size; funnel orgs excluded."""
+    tenant = await db.get(Tenant, tenant_id)
+    if not tenant:
+        raise HTTPException(status_code=404, detail="Tenant not found")
+    return await recommendations.recommend(db, tenant, limit)
+
+
 @router.post("", response_model=TenantRead, status_code=201)
 async def create_tenant(
     body: TenantCreate,
@@ -38,5 +58,6 @@ async def create_tenant(
     tenant = Tenant(**body.model_dump())
     db.add(tenant)
     await db.commit()
+    await response_cache.ainvalidate("tenants")
     await db.refresh(tenant)
     return tenant
@@ -1,13 +1,107 @@
+"""Database engines and session dependencies.
+
+``get_db`` sessions run on the primary. ``get_read_db`` sessions run on the
+read replica when ``database_read_url`` is set, and on the primary otherwise;
+use it for endpoints that only read indexer-fed data and can tolerate replica
+lag. Both engines use a queue pool sized from ``Settings`` whose checkouts are
+timed, so ``pool_status`` can report how long requests wait for a connection.
+"""
+
+import time
 from collections.abc import AsyncGenerator
+from dataclasses import dataclass
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
 
-engine = create_async_engine(settings.database_url, echo=False)
+
+@dataclass
+class PoolWaits:
+    """Connection checkout waits, including the connect time of new connections."""
+
+    checkouts: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    timeouts: int = 0
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` that records how long each checkout waited."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waits = PoolWaits()
+
+    def recreate(self) -> "TimedQueuePool":
+        pool = super().recreate()
+        pool.waits = self.waits
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.waits.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.waits.checkouts += 1
+            self.waits.wait_seconds += waited
+            self.waits.max_wait_seconds = max(self.waits.max_wait_seconds, waited)
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        echo=False,
+        poolclass=TimedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+
+
+engine = _create_engine(settings.database_url)
+read_engine = _create_engine(settings.database_read_url) if settings.database_read_url else engine
+
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+read_session = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
         yield session
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    async with read_session() as session:
+        yield session
+
+
+def pool_status() -> dict[str, dict[str, int | float]]:
+    """Current pool usage and cumulative checkout waits, keyed ``primary``/``replica``."""
+    engines = {"primary": engine}
+    if read_engine is not engine:
+        engines["replica"] = read_engine
+    status = {}
+    for name, eng in engines.items():
+        pool = eng.pool
+        waits = pool.waits
+        status[name] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": settings.db_max_overflow,
+            "checkouts": waits.checkouts,
+            "wait_seconds_total": round(waits.wait_seconds, 6),
+            "wait_seconds_max": round(waits.max_wait_seconds, 6),
+            "timeouts": waits.timeouts,
+        }
+    return status
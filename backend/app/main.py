@@ -1,16 +1,26 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import grants, organizations, tenants, funnel
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.db import engine, pool_status, read_engine
+from app.metrics import CONTENT_TYPE, MetricsMiddleware, instrument_engine, render
+
+instrument_engine(engine, "primary")
+if read_engine is not engine:
+    instrument_engine(read_engine, "replica")
 
 app = FastAPI(title="Grant Funnel", version="0.1.0")
 
+app.add_middleware(MetricsMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 app.include_router(organizations.router, prefix="/api/organizations", tags=["organizations"])
@@ -22,3 +32,15 @@ app.include_router(funnel.router, prefix="/api/tenants/{tenant_id}/funnel", tags
 @app.get("/api/health")
 async def health() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/api/health/pool")
+async def health_pool() -> dict[str, dict[str, int | float]]:
+    """Connection pool usage and checkout waits per engine."""
+    return pool_status()
+
+
+@app.get("/api/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus text exposition of request, database, pool and cache metrics."""
+    return Response(render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,270 @@
+"""Request-level instrumentation exported in Prometheus text format.
+
+``MetricsMiddleware`` times every HTTP request and labels it with the matched
+route template (``/api/organizations/{org_id}``), never the raw path, so label
+cardinality stays bounded. Cursor event hooks installed by
+``instrument_engine`` count the queries each request runs and the time spent
+in them; a request running more than ``query_count_warn_threshold`` queries is
+logged as a likely N+1. Connection pool and response cache figures are read
+at scrape time. ``render`` produces the exposition served at ``/api/metrics``.
+"""
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextvars import Context, ContextVar, copy_context
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.db import pool_status
+from app.services.response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Route label for requests no route matched (404s, probes); keeps raw paths out of labels.
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+
+    @abstractmethod
+    def samples(self) -> Iterator[str]: ...
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self.samples()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def set_total(self, value: float, *labels: str) -> None:
+        """Mirror a cumulative total kept elsewhere (read at scrape time)."""
+        self._values[labels] = value
+
+    def samples(self) -> Iterator[str]:
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{_labels(self.label_names, labels)} {value:g}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+        # Per label set: per-bucket counts (last slot is +Inf), sum, count.
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0, 0])
+        counts, totals = series
+        counts[bisect_left(self.buckets, value)] += 1
+        totals[0] += value
+        totals[1] += 1
+
+    def samples(self) -> Iterator[str]:
+        for labels, (counts, (total, count)) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, n in zip((*self.buckets, float("inf")), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                bucket_labels = _labels(self.label_names, labels, f'le="{le}"')
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.label_names, labels)} {total:g}"
+            yield f"{self.name}_count{_labels(self.label_names, labels)} {count}"
+
+
+http_requests = Counter("http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+http_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency, including streamed bodies.", ("method", "route")
+)
+request_queries = Histogram(
+    "http_request_db_queries", "Database queries run per HTTP request.", ("method", "route"), QUERY_COUNT_BUCKETS
+)
+request_db_time = Histogram(
+    "http_request_db_seconds", "Time per HTTP request spent executing database queries.", ("method", "route")
+)
+query_heavy_requests = Counter(
+    "http_requests_query_heavy_total",
+    "Requests that ran more queries than the N+1 warning threshold.",
+    ("method", "route"),
+)
+db_queries = Histogram("db_query_duration_seconds", "Duration of individual database queries.", ("engine",))
+
+pool_gauges = {
+    key: Gauge(f"db_pool_{key}", help, ("engine",))
+    for key, help in (
+        ("size", "Configured pool size."),
+        ("checked_out", "Connections currently in use."),
+        ("checked_in", "Idle connections held by the pool."),
+        ("overflow", "Connections open beyond the pool size."),
+    )
+}
+pool_checkouts = Counter("db_pool_checkouts_total", "Connection checkouts.", ("engine",))
+pool_wait = Counter("db_pool_checkout_wait_seconds_total", "Time spent waiting for a connection.", ("engine",))
+pool_wait_max = Gauge("db_pool_checkout_wait_seconds_max", "Longest single checkout wait.", ("engine",))
+pool_timeouts = Counter("db_pool_timeouts_total", "Checkouts that gave up after the pool timeout.", ("engine",))
+cache_requests = Counter("response_cache_requests_total", "Response cache lookups by result.", ("result",))
+
+REGISTRY: list[_Metric] = [
+    http_requests,
+    http_duration,
+    request_queries,
+    request_db_time,
+    query_heavy_requests,
+    db_queries,
+    *pool_gauges.values(),
+    pool_checkouts,
+    pool_wait,
+    pool_wait_max,
+    pool_timeouts,
+    cache_requests,
+]
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def background_context() -> Context:
+    """A copy of the current context detached from any request.
+
+    Tasks spawned while handling a request inherit its context; run the ones
+    that outlive it in this one so their queries are not charged to its route.
+    """
+    context = copy_context()
+    context.run(_request_stats.set, None)
+    return context
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Time every cursor execution on ``engine`` and charge it to the current request."""
+
+    # The start time lives on the statement's execution context, so a statement
+    # that raises (and never reaches after_cursor_execute) leaves nothing behind.
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        db_queries.observe(elapsed, name)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streamed responses pass through untouched."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_stats.reset(token)
+            route = scope.get("route")
+            path = getattr(route, "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            http_requests.inc(method, path, str(status))
+            http_duration.observe(elapsed, method, path)
+            request_queries.observe(stats.queries, method, path)
+            request_db_time.observe(stats.db_seconds, method, path)
+            if stats.queries > settings.query_count_warn_threshold:
+                query_heavy_requests.inc(method, path)
+                logger.warning(
+                    "Possible N+1: %s %s ran %d queries (%.1f ms in DB, %.1f ms total)",
+                    method, scope["path"], stats.queries, stats.db_seconds * 1000, elapsed * 1000,
+                )
+
+
+def render() -> str:
+    """The Prometheus exposition of all metrics, refreshing pool and cache figures first."""
+    for engine_name, status in pool_status().items():
+        for key, gauge in pool_gauges.items():
+            gauge.set(status[key], engine_name)
+        pool_checkouts.set_total(status["checkouts"], engine_name)
+        pool_wait.set_total(status["wait_seconds_total"], engine_name)
+        pool_wait_max.set(status["wait_seconds_max"], engine_name)
+        pool_timeouts.set_total(status["timeouts"], engine_name)
+    cache_requests.set_total(response_cache.hits, "hit")
+    cache_requests.set_total(response_cache.misses, "miss")
+    cache_requests.set_total(response_cache.not_modified, "not_modified")
+
+    lines = [line for metric in REGISTRY for line in metric.render()]
+    return "\n".join(lines) + "\n"
@@ -3,5 +3,19 @@ from app.models.organization import Organization
 from app.models.grant import Grant
 from app.models.tenant import Tenant
 from app.models.funnel_entry import FunnelEntry, FunnelStatus
+from app.models.funnel_status_count import FunnelStatusCount
+from app.models.giving_summary import GivingPair, GivingSummary
+from app.models.indexer_checkpoint import IndexerCheckpoint
 
-__all__ = ["Base", "Organization", "Grant", "Tenant", "FunnelEntry", "FunnelStatus"]
+__all__ = [
+    "Base",
+    "Organization",
+    "Grant",
+    "Tenant",
+    "FunnelEntry",
+    "FunnelStatus",
+    "FunnelStatusCount",
+    "GivingPair",
+    "GivingSummary",
+    "IndexerCheckpoint",
+]
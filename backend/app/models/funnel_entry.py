@@ -1,7 +1,7 @@
 import enum
 import uuid
 
-from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin, UUIDPrimaryKey
@@ -18,7 +18,16 @@ class FunnelStatus(str, enum.Enum):
 
 class FunnelEntry(UUIDPrimaryKey, TimestampMixin, Base):
     __tablename__ = "funnel_entries"
-    __table_args__ = (UniqueConstraint("tenant_id", "org_id", name="uq_funnel_tenant_org"),)
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "org_id", name="uq_funnel_tenant_org"),
+        # Keyset pagination order for list_funnel_entries, without and with a
+        # status filter. Read backwards for the updated_at DESC, id DESC order;
+        # benchmarks/funnel_plan.py checks the plans never sort.
+        Index("ix_funnel_entries_tenant_updated_at_id", "tenant_id", "updated_at", "id"),
+        Index("ix_funnel_entries_tenant_status_updated_at_id", "tenant_id", "status", "updated_at", "id"),
+        # Backs the org_id foreign key, so deleting an organization does not scan every funnel.
+        Index("ix_funnel_entries_org_id", "org_id"),
+    )
 
     tenant_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("tenants.id"))
     org_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("organizations.id"))
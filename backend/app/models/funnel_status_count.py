@@ -0,0 +1,22 @@
+import uuid
+
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+from app.models.funnel_entry import FunnelStatus
+
+
+class FunnelStatusCount(Base):
+    """Number of funnel entries per (tenant, status).
+
+    Maintained by statement-level triggers on ``funnel_entries`` (see the
+    ``funnel_status_counts`` migration), so every write path, including bulk
+    inserts and the seed script, keeps it current. Never write to it directly.
+    """
+
+    __tablename__ = "funnel_status_counts"
+
+    tenant_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True)
+    status: Mapped[FunnelStatus] = mapped_column(primary_key=True)
+    count: Mapped[int] = mapped_column(default=0)
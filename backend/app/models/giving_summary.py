@@ -0,0 +1,48 @@
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import ForeignKey, Numeric
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+# ``year`` of the row holding an organization's all-years totals. Distinct
+# counterparty counts cannot be summed across years, so totals are stored.
+ALL_YEARS = 0
+
+
+class GivingSummary(Base):
+    """Grant aggregates per organization and year, derived from ``grants``.
+
+    Kept current by ``app.services.giving.apply_giving_deltas``, which adds
+    each grant change to the rows it affects. Grants without a year count
+    towards the ``ALL_YEARS`` row only.
+    """
+
+    __tablename__ = "giving_summaries"
+
+    org_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True)
+    year: Mapped[int] = mapped_column(primary_key=True)
+    given_amount: Mapped[Decimal] = mapped_column(Numeric, default=0)
+    given_count: Mapped[int] = mapped_column(default=0)
+    grantees: Mapped[int] = mapped_column(default=0)
+    received_amount: Mapped[Decimal] = mapped_column(Numeric, default=0)
+    received_count: Mapped[int] = mapped_column(default=0)
+    funders: Mapped[int] = mapped_column(default=0)
+
+
+class GivingPair(Base):
+    """Grants per funder, grantee and year (``ALL_YEARS`` for all of them).
+
+    Bookkeeping for the distinct counterparty counts in ``GivingSummary``: a
+    pair appearing or disappearing moves ``grantees`` and ``funders``. Rows
+    exist only while grants do, and grants already reference both
+    organizations, so there are no foreign keys here.
+    """
+
+    __tablename__ = "giving_pairs"
+
+    funder_org_id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    grantee_org_id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    year: Mapped[int] = mapped_column(primary_key=True)
+    grants: Mapped[int]
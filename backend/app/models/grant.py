@@ -3,7 +3,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import ForeignKey, Index, Numeric, func
+from sqlalchemy import BigInteger, ForeignKey, Index, Numeric, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, UUIDPrimaryKey
@@ -15,6 +15,11 @@ class Grant(UUIDPrimaryKey, Base):
         Index("ix_grants_funder", "funder_org_id"),
         Index("ix_grants_grantee", "grantee_org_id"),
         Index("ix_grants_funder_grantee", "funder_org_id", "grantee_org_id"),
+        # Keyset pagination order for list_grants, unfiltered and per funder/grantee.
+        Index("ix_grants_created_at_id", "created_at", "id"),
+        Index("ix_grants_funder_created_at_id", "funder_org_id", "created_at", "id"),
+        Index("ix_grants_grantee_created_at_id", "grantee_org_id", "created_at", "id"),
+        Index("ix_grants_created_xid", "created_xid"),
     )
 
     funder_org_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("organizations.id"))
@@ -23,6 +28,12 @@ class Grant(UUIDPrimaryKey, Base):
     year: Mapped[Optional[int]]
     source: Mapped[Optional[str]]
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    # Id of the inserting transaction. Unlike created_at (the transaction's start
+    # time), it orders rows against snapshots: every row a snapshot cannot see
+    # has an id at or above the snapshot's xmin. Null for rows older than the column.
+    created_xid: Mapped[Optional[int]] = mapped_column(
+        BigInteger, server_default=text("pg_current_xact_id()::text::bigint")
+    )
 
     funder: Mapped["Organization"] = relationship(  # noqa: F821
         back_populates="grants_given", foreign_keys=[funder_org_id]
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin, UUIDPrimaryKey
@@ -8,7 +8,18 @@ from app.models.base import Base, TimestampMixin, UUIDPrimaryKey
 
 class Organization(UUIDPrimaryKey, TimestampMixin, Base):
     __tablename__ = "organizations"
-    __table_args__ = (UniqueConstraint("registry", "external_id", name="uq_org_registry_external_id"),)
+    __table_args__ = (
+        UniqueConstraint("registry", "external_id", name="uq_org_registry_external_id"),
+        # Keyset pagination order for list_organizations.
+        Index("ix_organizations_name_id", "name", "id"),
+        # Trigram index (pg_trgm) serving ILIKE '%q%' and similarity search on name.
+        Index(
+            "ix_organizations_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
 
     name: Mapped[str]
     country: Mapped[Optional[str]]
@@ -1,21 +1,53 @@
 from app.schemas.organization import (
+    OrganizationBatchByKeyResult,
+    OrganizationBatchGet,
+    OrganizationBatchGetByKey,
+    OrganizationBatchResult,
+    OrganizationCount,
     OrganizationCreate,
+    OrganizationKey,
     OrganizationRead,
+    OrganizationSearchResult,
+    OrganizationSimilarity,
     OrganizationUpdate,
 )
 from app.schemas.grant import GrantCreate, GrantRead
+from app.schemas.giving_summary import GivingSummaryRead, GivingTotals, GivingYear
+from app.schemas.recommendation import Recommendation
 from app.schemas.tenant import TenantCreate, TenantRead
-from app.schemas.funnel_entry import FunnelEntryCreate, FunnelEntryRead, FunnelEntryUpdate
+from app.schemas.funnel_entry import (
+    FunnelEntryBulkResult,
+    FunnelEntryCreate,
+    FunnelEntryExpanded,
+    FunnelEntryRead,
+    FunnelEntryUpdate,
+    FunnelSummary,
+)
 
 __all__ = [
+    "OrganizationBatchByKeyResult",
+    "OrganizationBatchGet",
+    "OrganizationBatchGetByKey",
+    "OrganizationBatchResult",
+    "OrganizationCount",
     "OrganizationCreate",
+    "OrganizationKey",
     "OrganizationRead",
+    "OrganizationSearchResult",
+    "OrganizationSimilarity",
     "OrganizationUpdate",
     "GrantCreate",
     "GrantRead",
+    "GivingSummaryRead",
+    "GivingTotals",
+    "GivingYear",
+    "Recommendation",
     "TenantCreate",
     "TenantRead",
+    "FunnelEntryBulkResult",
     "FunnelEntryCreate",
+    "FunnelEntryExpanded",
     "FunnelEntryRead",
     "FunnelEntryUpdate",
+    "FunnelSummary",
 ]
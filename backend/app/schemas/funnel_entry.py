@@ -4,6 +4,7 @@ from datetime import datetime
 from pydantic import BaseModel
 
 from app.models.funnel_entry import FunnelStatus
+from app.schemas.organization import OrganizationRead
 
 
 class FunnelEntryCreate(BaseModel):
@@ -24,3 +25,22 @@ class FunnelEntryRead(BaseModel):
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class FunnelEntryExpanded(FunnelEntryRead):
+    """``FunnelEntryRead`` with the organization inlined (``?expand=organization``)."""
+
+    organization: OrganizationRead | None = None
+
+
+class FunnelEntryBulkResult(BaseModel):
+    """Outcome of a bulk add: entries created or updated, and org ids left untouched."""
+
+    created: list[FunnelEntryRead]
+    updated: list[FunnelEntryRead]
+    skipped: list[uuid.UUID]
+
+
+class FunnelSummary(BaseModel):
+    counts: dict[FunnelStatus, int]
+    total: int
@@ -0,0 +1,27 @@
+import uuid
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+
+class GivingTotals(BaseModel):
+    given_amount: Decimal = Decimal(0)
+    given_count: int = 0
+    grantees: int = 0
+    received_amount: Decimal = Decimal(0)
+    received_count: int = 0
+    funders: int = 0
+
+    model_config = {"from_attributes": True}
+
+
+class GivingYear(GivingTotals):
+    year: int
+
+
+class GivingSummaryRead(BaseModel):
+    """``total`` covers all grants, including those without a year; ``by_year`` is newest first."""
+
+    org_id: uuid.UUID
+    total: GivingTotals
+    by_year: list[GivingYear]
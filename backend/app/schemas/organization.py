@@ -2,7 +2,10 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+# Upper bound on ids/keys per batch-get request.
+BATCH_GET_MAX = 5000
 
 
 class OrganizationCreate(BaseModel):
@@ -38,3 +41,45 @@ class OrganizationRead(BaseModel):
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class OrganizationSearchResult(OrganizationRead):
+    score: float
+
+
+class OrganizationSimilarity(OrganizationRead):
+    """An organization ranked by co-funding overlap with another one."""
+
+    score: float
+
+
+class OrganizationCount(BaseModel):
+    count: int
+    exact: bool
+
+
+class OrganizationKey(BaseModel):
+    registry: str
+    external_id: str
+
+
+class OrganizationBatchGet(BaseModel):
+    ids: list[uuid.UUID] = Field(..., max_length=BATCH_GET_MAX)
+
+
+class OrganizationBatchGetByKey(BaseModel):
+    keys: list[OrganizationKey] = Field(..., max_length=BATCH_GET_MAX)
+
+
+class OrganizationBatchResult(BaseModel):
+    """Batch-get results in request order; ``None`` marks an id that was not found."""
+
+    organizations: list[Optional[OrganizationRead]]
+    missing: list[uuid.UUID]
+
+
+class OrganizationBatchByKeyResult(BaseModel):
+    """Batch-get-by-key results in request order; ``None`` marks a key that was not found."""
+
+    organizations: list[Optional[OrganizationRead]]
+    missing: list[OrganizationKey]
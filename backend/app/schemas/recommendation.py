@@ -0,0 +1,10 @@
+from app.schemas.organization import OrganizationRead
+
+
+class Recommendation(OrganizationRead):
+    """A prospect for a tenant's funnel; signal scores are in [0, 1]."""
+
+    score: float
+    shared_funders: float
+    geography: float
+    grant_size: float
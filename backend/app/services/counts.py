@@ -0,0 +1,105 @@
+"""Cheap row counts for paginated listings.
+
+An exact ``COUNT(*)`` over a multi-million-row table costs more than the page
+it is shown next to. ``count_organizations`` instead counts exactly only up to
+``EXACT_COUNT_CAP`` rows and beyond that returns an estimate: ``reltuples``
+from ``pg_class`` for the whole table, the planner's row estimate for a
+search (``search_filter``). Estimates are flagged ``exact=False``. Callers can
+opt into an exact count, which is cached separately for ``EXACT_TTL`` seconds.
+"""
+
+import json
+import time
+
+from sqlalchemy import ColumnElement, func, literal_column, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.organization import Organization
+
+# Counts at or below this are computed exactly; the capped scan stops here.
+EXACT_COUNT_CAP = 1000
+# Shorter queries hold no trigram, so substring and fuzzy matching could not use the index.
+MIN_TRIGRAM_QUERY = 3
+ESTIMATE_TTL = 60.0
+EXACT_TTL = 300.0
+MAX_CACHED_QUERIES = 1024
+
+_estimates: dict[str | None, tuple[float, int, bool]] = {}
+_exact: dict[str | None, tuple[float, int]] = {}
+
+
+def _cached(cache: dict, key: str | None) -> tuple | None:
+    hit = cache.get(key)
+    if hit is None or hit[0] < time.monotonic():
+        return None
+    return hit[1:]
+
+
+def _store(cache: dict, key: str | None, ttl: float, *value) -> None:
+    if len(cache) >= MAX_CACHED_QUERIES:
+        # Drop the entry closest to expiry; good enough for a small bounded cache.
+        cache.pop(min(cache, key=lambda k: cache[k][0]))
+    cache[key] = (time.monotonic() + ttl, *value)
+
+
+def search_filter(q: str) -> ColumnElement[bool]:
+    """Organizations matching ``q``: substring or fuzzy word matches.
+
+    Every ``q`` consumer (list, count, export and ``/search``) filters with
+    this, so a total always counts the rows the pages show. Queries shorter than
+    ``MIN_TRIGRAM_QUERY`` match name prefixes instead: an anchored pattern
+    still yields trigrams for the index, where ``%ab%`` and ``%>`` fall back
+    to a sequential scan.
+    """
+    if len(q) < MIN_TRIGRAM_QUERY:
+        return Organization.name.ilike(f"{q}%")
+    return or_(Organization.name.ilike(f"%{q}%"), Organization.name.op("%>")(q))
+
+
+async def count_organizations(db: AsyncSession, q: str | None = None, exact: bool = False) -> tuple[int, bool]:
+    """Return ``(count, exact)`` for organizations matching ``q`` (all when ``q`` is empty)."""
+    q = q or None
+    if exact:
+        if (hit := _cached(_exact, q)) is not None:
+            return hit[0], True
+        stmt = select(func.count()).select_from(Organization)
+        if q:
+            stmt = stmt.where(search_filter(q))
+        count = (await db.execute(stmt)).scalar_one()
+        _store(_exact, q, EXACT_TTL, count)
+        return count, True
+
+    if (hit := _cached(_estimates, q)) is not None:
+        return hit[0], hit[1]
+
+    capped = select(Organization.id)
+    if q:
+        capped = capped.where(search_filter(q))
+    capped = capped.limit(EXACT_COUNT_CAP + 1).subquery()
+    count = (await db.execute(select(func.count()).select_from(capped))).scalar_one()
+    is_exact = count <= EXACT_COUNT_CAP
+    if not is_exact:
+        estimate = await (_planner_estimate(db, q) if q else _table_estimate(db))
+        count = max(count, estimate)
+    _store(_estimates, q, ESTIMATE_TTL, count, is_exact)
+    return count, is_exact
+
+
+async def _table_estimate(db: AsyncSession) -> int:
+    result = await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'organizations'::regclass")
+    )
+    # reltuples is -1 until the table has been vacuumed or analyzed.
+    return max(result.scalar_one(), 0)
+
+
+async def _planner_estimate(db: AsyncSession, q: str) -> int:
+    stmt = select(literal_column("1")).select_from(Organization).where(search_filter(q))
+    conn = await db.connection()
+    # Rendered with literal values: EXPLAIN cannot take bound parameters.
+    sql = stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
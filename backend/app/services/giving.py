@@ -0,0 +1,197 @@
+"""Maintenance of the ``giving_summaries`` aggregate table.
+
+Grant changes are applied as deltas: ``apply_giving_deltas`` adds the inserted
+(or subtracts the deleted) grants' amounts and counts to the summary rows of
+their funders and grantees, so its cost is proportional to the changed grants,
+not to the organizations' whole grant history. Distinct counterparty counts
+cannot be added up, so ``giving_pairs`` counts grants per funder, grantee and
+year, and a pair appearing or disappearing moves ``grantees`` and ``funders``.
+Callers apply deltas inside the transaction that changed the grants, so
+summaries never lag committed data. The COPY loader stages its inserted grants
+in a table and applies them with ``apply_staged_giving_deltas`` instead.
+
+Each delta is a single ``INSERT ... ON CONFLICT`` per table that locks rows in
+key order: concurrent writers touching the same organizations wait for each
+other instead of colliding on the primary key or deadlocking.
+``rebuild_giving_summaries`` recomputes both tables from ``grants`` with one
+grouped statement each (``GROUPING SETS`` yields the yearly rows and the
+all-years row in a single pass).
+"""
+
+import uuid
+from collections.abc import Iterable
+from decimal import Decimal
+
+from sqlalchemy import Connection, Executable, Integer, Numeric, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.giving_summary import ALL_YEARS
+
+# (funder_org_id, grantee_org_id, amount, year) of a grant.
+GrantFigures = tuple[uuid.UUID, uuid.UUID, Decimal | None, int | None]
+
+# Grants passed as parallel arrays; ``sign`` is -1 for removals.
+_UNNEST = """
+    SELECT d.*, CAST(:sign AS integer) AS sign
+    FROM unnest(
+        CAST(:funders AS uuid[]), CAST(:grantees AS uuid[]), CAST(:amounts AS numeric[]), CAST(:years AS integer[])
+    ) AS d(funder_org_id, grantee_org_id, amount, year)
+"""
+
+
+def _apply(delta: str) -> str:
+    """The delta statement over ``delta``, a query of (funder_org_id, grantee_org_id, amount, year, sign)."""
+    return f"""
+WITH delta AS ({delta}),
+-- Every grant counts towards its year's rows and the all-years rows.
+yearly AS (
+    SELECT d.funder_org_id, d.grantee_org_id, COALESCE(d.amount, 0) * d.sign AS amount, d.sign, y.year
+    FROM delta AS d, LATERAL (VALUES (d.year), ({ALL_YEARS})) AS y(year)
+    WHERE y.year IS NOT NULL
+),
+pair_delta AS (
+    SELECT funder_org_id, grantee_org_id, year, sum(sign) AS n
+    FROM yearly
+    GROUP BY funder_org_id, grantee_org_id, year
+),
+pairs AS (
+    INSERT INTO giving_pairs AS p (funder_org_id, grantee_org_id, year, grants)
+    SELECT funder_org_id, grantee_org_id, year, n FROM pair_delta
+    ORDER BY funder_org_id, grantee_org_id, year
+    ON CONFLICT (funder_org_id, grantee_org_id, year) DO UPDATE SET grants = p.grants + excluded.grants
+    RETURNING p.funder_org_id, p.grantee_org_id, p.year, p.grants
+),
+-- +1 where a pair's first grant arrived, -1 where its last one went.
+presence AS (
+    SELECT pairs.funder_org_id, pairs.grantee_org_id, pairs.year,
+        (pairs.grants > 0)::int - (pairs.grants - d.n > 0)::int AS change
+    FROM pairs JOIN pair_delta AS d USING (funder_org_id, grantee_org_id, year)
+)
+INSERT INTO giving_summaries AS s
+    (org_id, year, given_amount, given_count, grantees, received_amount, received_count, funders)
+SELECT org_id, year, sum(given_amount), sum(given_count), sum(grantees),
+    sum(received_amount), sum(received_count), sum(funders)
+FROM (
+    SELECT funder_org_id AS org_id, year, amount AS given_amount, sign AS given_count, 0 AS grantees,
+        0 AS received_amount, 0 AS received_count, 0 AS funders
+    FROM yearly
+    UNION ALL
+    SELECT grantee_org_id, year, 0, 0, 0, amount, sign, 0 FROM yearly
+    UNION ALL
+    SELECT funder_org_id, year, 0, 0, change, 0, 0, 0 FROM presence WHERE change <> 0
+    UNION ALL
+    SELECT grantee_org_id, year, 0, 0, 0, 0, 0, change FROM presence WHERE change <> 0
+) AS c
+GROUP BY org_id, year
+ORDER BY org_id, year
+ON CONFLICT (org_id, year) DO UPDATE SET
+    given_amount = s.given_amount + excluded.given_amount,
+    given_count = s.given_count + excluded.given_count,
+    grantees = s.grantees + excluded.grantees,
+    received_amount = s.received_amount + excluded.received_amount,
+    received_count = s.received_count + excluded.received_count,
+    funders = s.funders + excluded.funders
+"""
+
+
+_APPLY = text(_apply(_UNNEST)).bindparams(
+    bindparam("funders", type_=ARRAY(UUID(as_uuid=True))),
+    bindparam("grantees", type_=ARRAY(UUID(as_uuid=True))),
+    bindparam("amounts", type_=ARRAY(Numeric)),
+    bindparam("years", type_=ARRAY(Integer)),
+    bindparam("sign", type_=Integer),
+)
+
+# After deletions: pairs without grants and summaries of organizations left without any in that year.
+_PRUNE = [
+    text("DELETE FROM giving_pairs WHERE funder_org_id = ANY(:funders) AND grants = 0").bindparams(
+        bindparam("funders", type_=ARRAY(UUID(as_uuid=True)))
+    ),
+    text(
+        "DELETE FROM giving_summaries WHERE org_id = ANY(:org_ids) AND given_count = 0 AND received_count = 0"
+    ).bindparams(bindparam("org_ids", type_=ARRAY(UUID(as_uuid=True)))),
+]
+
+_REBUILD = [
+    # Writers applying deltas wait for the rebuild, and see its rows once it commits.
+    text("LOCK TABLE giving_summaries, giving_pairs IN EXCLUSIVE MODE"),
+    text("DELETE FROM giving_summaries"),
+    text("DELETE FROM giving_pairs"),
+    text(
+        f"""
+INSERT INTO giving_pairs (funder_org_id, grantee_org_id, year, grants)
+SELECT funder_org_id, grantee_org_id, COALESCE(year, {ALL_YEARS}), count(*)
+FROM grants
+GROUP BY GROUPING SETS ((funder_org_id, grantee_org_id, year), (funder_org_id, grantee_org_id))
+HAVING NOT (GROUPING(year) = 0 AND year IS NULL)
+"""
+    ),
+    text(
+        f"""
+INSERT INTO giving_summaries
+    (org_id, year, given_amount, given_count, grantees, received_amount, received_count, funders)
+SELECT
+    org_id,
+    COALESCE(year, {ALL_YEARS}),
+    COALESCE(sum(amount) FILTER (WHERE given), 0),
+    count(*) FILTER (WHERE given),
+    count(DISTINCT counterpart) FILTER (WHERE given),
+    COALESCE(sum(amount) FILTER (WHERE NOT given), 0),
+    count(*) FILTER (WHERE NOT given),
+    count(DISTINCT counterpart) FILTER (WHERE NOT given)
+FROM (
+    SELECT funder_org_id AS org_id, grantee_org_id AS counterpart, true AS given, amount, year FROM grants
+    UNION ALL
+    SELECT grantee_org_id, funder_org_id, false, amount, year FROM grants
+) AS g
+GROUP BY GROUPING SETS ((org_id, year), (org_id))
+-- Grants without a year belong to the totals only, not to a yearly row.
+HAVING NOT (GROUPING(year) = 0 AND year IS NULL)
+"""
+    ),
+]
+
+
+def _statements(grants: Iterable[GrantFigures], removed: bool) -> list[tuple[Executable, dict]]:
+    rows = list(grants)
+    if not rows:
+        return []
+    funders, grantees, amounts, years = (list(column) for column in zip(*rows))
+    params = {"funders": funders, "grantees": grantees, "amounts": amounts, "years": years}
+    statements = [(_APPLY, {**params, "sign": -1 if removed else 1})]
+    if removed:
+        org_ids = sorted(set(funders) | set(grantees))
+        statements += [(_PRUNE[0], {"funders": sorted(set(funders))}), (_PRUNE[1], {"org_ids": org_ids})]
+    return statements
+
+
+def apply_giving_deltas(
+    session: Session | Connection, grants: Iterable[GrantFigures], removed: bool = False
+) -> None:
+    """Add ``grants`` (just inserted) to the summaries, or subtract them when ``removed``."""
+    for stmt, params in _statements(grants, removed):
+        session.execute(stmt, params)
+
+
+async def aapply_giving_deltas(db: AsyncSession, grants: Iterable[GrantFigures], removed: bool = False) -> None:
+    """Async variant of ``apply_giving_deltas``."""
+    for stmt, params in _statements(grants, removed):
+        await db.execute(stmt, params)
+
+
+def apply_staged_giving_deltas(session: Session | Connection, table: str) -> None:
+    """Add the just-inserted grants listed in ``table`` to the summaries in one statement.
+
+    ``table`` has ``funder_org_id``, ``grantee_org_id``, ``amount`` and ``year``
+    columns; bulk loaders stage their inserted grants there instead of passing
+    millions of values as parameters.
+    """
+    session.execute(text(_apply(f"SELECT funder_org_id, grantee_org_id, amount, year, 1 AS sign FROM {table}")))
+
+
+def rebuild_giving_summaries(session: Session | Connection) -> None:
+    """Recompute every summary and pair from ``grants`` in the session's transaction."""
+    for stmt in _REBUILD:
+        session.execute(stmt)
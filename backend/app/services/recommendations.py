@@ -0,0 +1,178 @@
+"""Ranked prospect recommendations for a tenant's funnel.
+
+Candidates come from the co-funding graph: organizations sharing funders with
+the tenant's funnel orgs and with the linked organization's own grantees.
+Their features (country, region, average grant received) are fetched in one
+query for the whole pool, and every candidate is scored in a single pass:
+
+* shared funders: co-funding score, scaled to the best candidate,
+* geography: share of reference orgs (funnel plus linked org) in the same
+  region and in the same country,
+* grant size: closeness of the candidate's average grant received to the
+  linked org's average grant given (the funnel's median when it gives none),
+  on a log scale.
+
+Orgs already in the funnel, the linked org and its current grantees are left
+out. Ranked lists are cached per tenant for ``cache_ttl`` seconds, until the
+co-funding graph is replaced or the funnel gains or loses an org
+(``invalidate``). Invalidation bumps a per-tenant generation in the shared
+response-cache backend, so with ``cache_url`` set it reaches every worker.
+"""
+
+import math
+import statistics
+import time
+import uuid
+from collections import Counter
+from collections.abc import Iterable
+from decimal import Decimal
+
+from sqlalchemy import and_, any_, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.funnel_entry import FunnelEntry
+from app.models.giving_summary import ALL_YEARS, GivingSummary
+from app.models.organization import Organization
+from app.models.tenant import Tenant
+from app.schemas.organization import OrganizationRead
+from app.schemas.recommendation import Recommendation
+from app.services.cofunding import CofundingGraph, cofunding_graph
+from app.services.response_cache import response_cache
+
+# Upper bound on recommendations per tenant; requests slice the cached list.
+MAX_RECOMMENDATIONS = 200
+# Co-funding candidates re-ranked with the other signals.
+CANDIDATE_POOL = 1000
+MAX_CACHED_TENANTS = 1024
+
+W_SHARED_FUNDERS = 0.6
+W_GEOGRAPHY = 0.25
+W_GRANT_SIZE = 0.15
+
+# tenant_id -> (graph, generation, expiry, ranking). A ranking is stored under
+# the generation read before it started, so one that read the funnel before a
+# concurrent change no longer matches once the change is invalidated.
+_cache: dict[uuid.UUID, tuple[CofundingGraph, str, float, list[Recommendation]]] = {}
+
+
+def _namespace(tenant_id: uuid.UUID) -> str:
+    return f"recommendations:{tenant_id}"
+
+
+async def invalidate(tenant_id: uuid.UUID) -> None:
+    """Drop the cached recommendations of ``tenant_id`` in every worker (its funnel changed)."""
+    await response_cache.ainvalidate(_namespace(tenant_id))
+    _cache.pop(tenant_id, None)
+
+
+async def recommend(db: AsyncSession, tenant: Tenant, limit: int) -> list[Recommendation]:
+    """The ``limit`` best prospects for ``tenant``, best first."""
+    graph = await cofunding_graph.get()
+    generation = await response_cache.generation(_namespace(tenant.id))
+    hit = _cache.get(tenant.id)
+    if hit is None or hit[0] is not graph or hit[1] != generation or hit[2] < time.monotonic():
+        ranking = await _rank(db, graph, tenant)
+        hit = (graph, generation, time.monotonic() + response_cache.ttl, ranking)
+        _cache.pop(tenant.id, None)
+        if len(_cache) >= MAX_CACHED_TENANTS:
+            _cache.pop(next(iter(_cache)))
+        _cache[tenant.id] = hit
+    return hit[3][:limit]
+
+
+async def _rank(db: AsyncSession, graph: CofundingGraph, tenant: Tenant) -> list[Recommendation]:
+    funnel = set(
+        (await db.execute(select(FunnelEntry.org_id).where(FunnelEntry.tenant_id == tenant.id))).scalars()
+    )
+    linked = tenant.linked_org_id
+    own_grantees = set(graph.grantees_of(linked)) if linked else set()
+    pool = graph.similar_grantees_to(
+        funnel | own_grantees,
+        CANDIDATE_POOL,
+        exclude=funnel | own_grantees | ({linked} if linked else set()),
+    )
+    if not pool:
+        return []
+
+    reference = await _features(db, [*funnel, *([linked] if linked else [])])
+    candidates = await _features(db, [org_id for org_id, _ in pool])
+    regions = _shares(org.region for org, _, _ in reference.values())
+    countries = _shares(org.country for org, _, _ in reference.values())
+    target_size = _target_grant_size(reference, linked, funnel)
+
+    best = pool[0][1]
+    scored = []
+    for org_id, cofunding in pool:
+        if org_id not in candidates:
+            continue  # deleted since the graph snapshot
+        org, received_avg, _ = candidates[org_id]
+        shared = cofunding / best
+        geography = 0.5 * regions.get(org.region, 0.0) + 0.5 * countries.get(org.country, 0.0)
+        size = _size_similarity(received_avg, target_size)
+        score = W_SHARED_FUNDERS * shared + W_GEOGRAPHY * geography + W_GRANT_SIZE * size
+        scored.append((score, org, shared, geography, size))
+    scored.sort(key=lambda row: row[0], reverse=True)
+    return [
+        Recommendation(
+            **OrganizationRead.model_validate(org).model_dump(),
+            score=round(score, 6),
+            shared_funders=round(shared, 6),
+            geography=round(geography, 6),
+            grant_size=round(size, 6),
+        )
+        for score, org, shared, geography, size in scored[:MAX_RECOMMENDATIONS]
+    ]
+
+
+async def _features(
+    db: AsyncSession, org_ids: list[uuid.UUID]
+) -> dict[uuid.UUID, tuple[Organization, float | None, float | None]]:
+    """``org_id -> (org, average grant received, average grant given)`` in one query."""
+    if not org_ids:
+        return {}
+    stmt = (
+        select(Organization, GivingSummary)
+        .outerjoin(
+            GivingSummary,
+            and_(GivingSummary.org_id == Organization.id, GivingSummary.year == ALL_YEARS),
+        )
+        .where(Organization.id == any_(literal(org_ids, ARRAY(Organization.id.type))))
+    )
+    return {
+        org.id: (
+            org,
+            _average(totals.received_amount, totals.received_count) if totals else None,
+            _average(totals.given_amount, totals.given_count) if totals else None,
+        )
+        for org, totals in await db.execute(stmt)
+    }
+
+
+def _average(amount: Decimal, count: int) -> float | None:
+    return float(amount) / count if count and amount > 0 else None
+
+
+def _shares(values: Iterable[str | None]) -> dict[str, float]:
+    """Fraction of the known ``values`` equal to each value."""
+    counts = Counter(value for value in values if value)
+    total = sum(counts.values())
+    return {value: n / total for value, n in counts.items()}
+
+
+def _target_grant_size(
+    reference: dict[uuid.UUID, tuple[Organization, float | None, float | None]],
+    linked: uuid.UUID | None,
+    funnel: set[uuid.UUID],
+) -> float | None:
+    if linked in reference and reference[linked][2] is not None:
+        return reference[linked][2]
+    sizes = [reference[org_id][1] for org_id in funnel if org_id in reference and reference[org_id][1]]
+    return statistics.median(sizes) if sizes else None
+
+
+def _size_similarity(size: float | None, target: float | None) -> float:
+    """1.0 for equal sizes, 0.5 when they differ by a factor of e, 0.0 when either is unknown."""
+    if not size or not target:
+        return 0.0
+    return 1.0 / (1.0 + abs(math.log(size / target)))
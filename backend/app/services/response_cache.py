@@ -0,0 +1,216 @@
+"""Read-through cache for hot GET endpoints.
+
+``ResponseCache.serve`` wraps an endpoint's loader: the serialized JSON body
+and any headers the loader set are stored under a key built from the route's
+namespace, the namespace's current generation and the request URL. Hits skip
+the database and serialization entirely. Every response carries a strong
+``ETag``; a matching ``If-None-Match`` is answered with ``304 Not Modified``.
+
+Writes invalidate by namespace: ``invalidate("grants")`` bumps the namespace's
+generation, so every key built under the old one stops matching and ages out
+of the store. That costs one ``INCR`` however many entries exist, and works
+the same from the API handlers and from the indexer.
+
+The store is anything that speaks ``CacheBackend`` (GET, SET with expiry and
+INCR). ``MemoryBackend`` is an in-process LRU and the default. Point
+``cache_url`` at a Redis-compatible server to share one cache between API
+workers and the indexer; with the in-process store, indexer runs cannot reach
+the API's cache and entries there go stale for at most ``cache_ttl`` seconds.
+
+Backends are synchronous so the indexer can use them directly. ``serve`` and
+``ainvalidate`` run the calls of a ``blocking`` backend (one that does network
+I/O) in a worker thread, so a slow cache server never stalls the event loop.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from typing import Any, Protocol
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Headers FastAPI sets itself; everything else a loader sets is cached with the body.
+_DROP_HEADERS = frozenset({"content-length", "content-type"})
+
+
+class CacheBackend(Protocol):
+    """A byte store with the semantics of Redis GET, SET EX and INCR."""
+
+    # True when calls wait on I/O; async callers then make them in a worker thread.
+    blocking: bool
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    def incr(self, key: str) -> int: ...
+
+
+class MemoryBackend:
+    """In-process LRU with per-entry expiry.
+
+    Counters are kept apart from the LRU so that a generation is never evicted
+    and reset underneath entries that were written with it.
+    """
+
+    blocking = False
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._counters: dict[str, int] = {}
+
+    def get(self, key: str) -> bytes | None:
+        if key in self._counters:
+            return str(self._counters[key]).encode()
+        hit = self._entries.get(key)
+        if hit is None:
+            return None
+        expires, value = hit
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+
+class RedisBackend:
+    """``CacheBackend`` over a Redis-compatible server (needs the ``redis`` package).
+
+    The client is thread-safe, so the worker threads ``ResponseCache`` hands
+    calls to share its connection pool.
+    """
+
+    blocking = True
+
+    def __init__(self, url: str):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> bytes | None:
+        return self._client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._client.set(key, value, px=int(ttl * 1000))
+
+    def incr(self, key: str) -> int:
+        return self._client.incr(key)
+
+
+@lru_cache
+def _adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+class ResponseCache:
+    def __init__(self, backend: CacheBackend, ttl: float = 300.0):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def invalidate(self, *namespaces: str) -> None:
+        """Drop every cached response in ``namespaces``; call after the write commits."""
+        for namespace in namespaces:
+            self.backend.incr(f"generation:{namespace}")
+
+    async def ainvalidate(self, *namespaces: str) -> None:
+        """``invalidate`` for request handlers, keeping backend I/O off the event loop."""
+        await self._call(self.invalidate, *namespaces)
+
+    async def _call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.backend.blocking:
+            # Unlike asyncio.to_thread, this does not carry the request's context
+            # (and its metrics) into the worker thread.
+            return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+        return fn(*args)
+
+    async def generation(self, namespace: str) -> str:
+        """The current generation of ``namespace``; ``invalidate`` changes it."""
+        generation = await self._call(self.backend.get, f"generation:{namespace}")
+        return generation.decode() if generation else "0"
+
+    async def _key(self, namespace: str, key: str) -> str:
+        return f"response:{namespace}:{await self.generation(namespace)}:{key}"
+
+    async def serve(
+        self,
+        request: Request,
+        namespace: str,
+        model: Any,
+        load: Callable[[Response], Awaitable[Any]],
+        key: str | None = None,
+    ) -> Response:
+        """Answer ``request`` from the cache, or from ``load`` serialized as ``model``.
+
+        ``load`` receives a scratch ``Response`` for any headers it wants to
+        set (pagination cursors); they are cached with the body. ``key``
+        defaults to the request path and sorted query string.
+        """
+        if key is None:
+            key = f"{request.url.path}?{'&'.join(sorted(str(request.query_params).split('&')))}"
+        cache_key = await self._key(namespace, key)
+        stored = await self._call(self.backend.get, cache_key)
+        if stored is not None:
+            self.hits += 1
+            etag, raw_headers, body = stored.split(b"\n", 2)
+            headers = json.loads(raw_headers)
+            cache_status = "HIT"
+        else:
+            self.misses += 1
+            scratch = Response()
+            body = _adapter(model).dump_json(await load(scratch))
+            headers = {k: v for k, v in scratch.headers.items() if k not in _DROP_HEADERS}
+            etag = _etag(body).encode()
+            value = b"\n".join([etag, json.dumps(headers).encode(), body])
+            await self._call(self.backend.set, cache_key, value, self.ttl)
+            cache_status = "MISS"
+
+        headers.update({"ETag": etag.decode(), "Cache-Control": "no-cache", "X-Cache": cache_status})
+        if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+
+def _backend() -> CacheBackend:
+    if settings.cache_url:
+        logger.info("Response cache backend: %s", settings.cache_url)
+        return RedisBackend(settings.cache_url)
+    return MemoryBackend(settings.cache_max_entries)
+
+
+response_cache = ResponseCache(_backend(), ttl=settings.cache_ttl)
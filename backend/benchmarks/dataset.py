@@ -0,0 +1,221 @@
+"""Synthetic load-test dataset: python -m benchmarks.dataset build|drop|describe
+
+Builds a dataset far larger than ``scripts/seed.py`` for ``benchmarks.load``:
+
+- ``--orgs`` organizations (2M by default) under the ``LOADBENCH`` registry,
+  named from small word lists so name searches hit realistic match counts.
+- ``--grants`` grants forming a power-law graph: funders are drawn with
+  heavily skewed rank (a few funders make most grants), grantees with a
+  milder skew.
+- ``--tenants`` tenants with large funnels: the first holds
+  ``--funnel-size`` entries and each further tenant half as many.
+
+Rows are generated server-side with ``generate_series``, in chunks so
+progress is visible. Unlike the other benchmarks the dataset is kept until
+``drop`` so that successive load runs measure the same data. Giving summaries
+are not built; the load scenarios do not read them.
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import Connection, Engine, create_engine, text
+
+from app.config import settings
+
+REGISTRY = "LOADBENCH"
+GRANT_SOURCE = "loadbench"
+TENANT_SLUG_PREFIX = "loadbench-funnel-"
+CHUNK_ROWS = 250_000
+
+# Organization names are "<first> <second> <kind>": 50 x 50 x 10 combinations,
+# so a single word matches about 2% of organizations and a word pair 0.04%.
+FIRST_WORDS = [
+    "Green", "River", "Open", "Bright", "Silver", "North", "Harbor", "Summit", "Cedar", "Maple",
+    "Golden", "Lake", "Stone", "Prairie", "Coastal", "Valley", "Eagle", "Pioneer", "Liberty", "Unity",
+    "Hope", "Heritage", "Horizon", "Beacon", "Granite", "Willow", "Oak", "Pine", "Blue", "Red",
+    "East", "West", "South", "Central", "Mountain", "Desert", "Island", "Forest", "Meadow", "Spring",
+    "Sunrise", "Evergreen", "Crescent", "Harmony", "Frontier", "Legacy", "Common", "Civic", "Little", "Grand",
+]
+SECOND_WORDS = [
+    "Health", "Education", "Arts", "Science", "Community", "Youth", "Family", "Climate", "Water", "Housing",
+    "Justice", "Literacy", "Music", "Medical", "Research", "Wildlife", "Ocean", "Food", "Energy", "Peace",
+    "Veterans", "Children", "Women", "Elder", "Rural", "Urban", "Heritage", "Library", "Theater", "Sports",
+    "Learning", "Wellness", "Nature", "Rivers", "Schools", "Neighbors", "Futures", "Voices", "Hands", "Bridges",
+    "Roots", "Seeds", "Harvest", "Light", "Vision", "Legal", "Refugee", "Disability", "Mental", "Digital",
+]
+KINDS = [
+    "Foundation", "Trust", "Fund", "Institute", "Society", "Alliance", "Network", "Project", "Initiative", "Council",
+]
+
+
+@dataclass
+class DatasetSize:
+    orgs: int
+    grants: int
+    funnels: dict[str, int]
+
+
+def _chunks(total: int) -> list[tuple[int, int]]:
+    return [(start, min(start + CHUNK_ROWS, total + 1) - 1) for start in range(1, total + 1, CHUNK_ROWS)]
+
+
+def _insert_orgs(conn: Connection, orgs: int) -> None:
+    for first, last in _chunks(orgs):
+        conn.execute(
+            text(
+                "INSERT INTO organizations (id, name, registry, external_id, country, city, region) "
+                "SELECT gen_random_uuid(), "
+                "(CAST(:first AS text[]))[1 + floor(random() * :n_first)::int] || ' ' || "
+                "(CAST(:second AS text[]))[1 + floor(random() * :n_second)::int] || ' ' || "
+                "(CAST(:kinds AS text[]))[1 + floor(random() * :n_kinds)::int], "
+                ":registry, lpad(i::text, 9, '0'), 'US', 'City ' || (i % 5000), 'S' || lpad((i % 50)::text, 2, '0') "
+                "FROM generate_series(:lo, :hi) AS i"
+            ),
+            {
+                "first": FIRST_WORDS,
+                "second": SECOND_WORDS,
+                "kinds": KINDS,
+                "n_first": len(FIRST_WORDS),
+                "n_second": len(SECOND_WORDS),
+                "n_kinds": len(KINDS),
+                "registry": REGISTRY,
+                "lo": first,
+                "hi": last,
+            },
+        )
+        conn.commit()
+        print(f"  organizations {last:,}/{orgs:,}", flush=True)
+
+
+def _insert_grants(conn: Connection, grants: int, orgs: int, funders: int) -> None:
+    # Organizations by rank (their numeric external_id), so random ranks can be joined to ids.
+    conn.execute(
+        text(
+            "CREATE TEMP TABLE loadbench_ranks ON COMMIT DROP AS "
+            "SELECT external_id::int AS rank, id FROM organizations WHERE registry = :registry"
+        ),
+        {"registry": REGISTRY},
+    )
+    conn.execute(text("ALTER TABLE loadbench_ranks ADD PRIMARY KEY (rank)"))
+    conn.execute(text("ANALYZE loadbench_ranks"))
+    for first, last in _chunks(grants):
+        # rank = 1 + floor(u^k * n) puts most of the mass on the lowest ranks:
+        # k=3 over the funder pool, k=1.5 over all organizations for grantees.
+        conn.execute(
+            text(
+                "INSERT INTO grants (id, funder_org_id, grantee_org_id, amount, year, source, created_at) "
+                "SELECT gen_random_uuid(), f.id, g.id, round((500 * exp(random() * 8))::numeric, -2), "
+                "2014 + floor(random() * 11)::int, :source, now() - random() * interval '3650 days' "
+                "FROM (SELECT 1 + floor(power(random(), 3) * :funders)::int AS funder_rank, "
+                "1 + floor(power(random(), 1.5) * :orgs)::int AS grantee_rank "
+                "FROM generate_series(:lo, :hi)) AS s "
+                "JOIN loadbench_ranks AS f ON f.rank = s.funder_rank "
+                "JOIN loadbench_ranks AS g ON g.rank = s.grantee_rank "
+                "WHERE f.id <> g.id"
+            ),
+            {"source": GRANT_SOURCE, "funders": funders, "orgs": orgs, "lo": first, "hi": last},
+        )
+        print(f"  grants {last:,}/{grants:,}", flush=True)
+    conn.commit()
+
+
+def _insert_funnels(conn: Connection, tenants: int, funnel_size: int, orgs: int) -> None:
+    for i in range(tenants):
+        size = min(max(funnel_size >> i, 1), orgs)
+        lo = 1 + (i * funnel_size // 4) % (orgs - size + 1)
+        tenant_id = conn.execute(
+            text("INSERT INTO tenants (id, name, slug) VALUES (gen_random_uuid(), :name, :slug) RETURNING id"),
+            {"name": f"Load bench tenant {i + 1}", "slug": f"{TENANT_SLUG_PREFIX}{i + 1}"},
+        ).scalar_one()
+        # A window of consecutive ranks, offset per tenant so funnels overlap partially.
+        # Statuses skew towards prospect; updated_at spreads over a year.
+        conn.execute(
+            text(
+                "INSERT INTO funnel_entries (id, tenant_id, org_id, status, created_at, updated_at) "
+                "SELECT gen_random_uuid(), :tenant_id, o.id, "
+                "(enum_range(NULL::funnelstatus))[1 + floor(power(random(), 2) * 6)::int], ts, ts "
+                "FROM organizations AS o, LATERAL (SELECT now() - random() * interval '365 days' AS ts) AS t "
+                "WHERE o.registry = :registry AND o.external_id BETWEEN :lo AND :hi"
+            ),
+            {"tenant_id": tenant_id, "registry": REGISTRY, "lo": f"{lo:09d}", "hi": f"{lo + size - 1:09d}"},
+        )
+        conn.commit()
+        print(f"  tenant {i + 1}: {size:,} funnel entries", flush=True)
+
+
+def describe(engine: Engine) -> DatasetSize | None:
+    """Sizes of the dataset in the database, or ``None`` if it has not been built."""
+    with engine.connect() as conn:
+        orgs = conn.execute(
+            text("SELECT count(*) FROM organizations WHERE registry = :registry"), {"registry": REGISTRY}
+        ).scalar_one()
+        if not orgs:
+            return None
+        grants = conn.execute(
+            text("SELECT count(*) FROM grants WHERE source = :source"), {"source": GRANT_SOURCE}
+        ).scalar_one()
+        funnels = conn.execute(
+            text(
+                "SELECT t.slug, coalesce(sum(c.count), 0) FROM tenants AS t "
+                "LEFT JOIN funnel_status_counts AS c ON c.tenant_id = t.id "
+                "WHERE t.slug LIKE :prefix GROUP BY t.slug ORDER BY t.slug"
+            ),
+            {"prefix": f"{TENANT_SLUG_PREFIX}%"},
+        ).all()
+    return DatasetSize(orgs=orgs, grants=grants, funnels={slug: int(count) for slug, count in funnels})
+
+
+def build(engine: Engine, orgs: int, grants: int, funders: int, tenants: int, funnel_size: int) -> None:
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        _insert_orgs(conn, orgs)
+        _insert_grants(conn, grants, orgs, min(funders, orgs))
+        _insert_funnels(conn, tenants, funnel_size, orgs)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in ("organizations", "grants", "funnel_entries", "tenants"):
+            conn.execute(text(f"VACUUM ANALYZE {table}"))
+    print(f"Built in {time.perf_counter() - started:.0f}s: {asdict(describe(engine))}")
+
+
+def drop(engine: Engine) -> None:
+    with engine.connect() as conn:
+        conn.execute(
+            text(
+                "DELETE FROM funnel_entries WHERE tenant_id IN (SELECT id FROM tenants WHERE slug LIKE :prefix)"
+            ),
+            {"prefix": f"{TENANT_SLUG_PREFIX}%"},
+        )
+        conn.execute(text("DELETE FROM tenants WHERE slug LIKE :prefix"), {"prefix": f"{TENANT_SLUG_PREFIX}%"})
+        conn.execute(text("DELETE FROM grants WHERE source = :source"), {"source": GRANT_SOURCE})
+        conn.execute(text("DELETE FROM organizations WHERE registry = :registry"), {"registry": REGISTRY})
+        conn.commit()
+    print("Dropped the load-test dataset")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build or drop the synthetic load-test dataset")
+    parser.add_argument("action", choices=["build", "drop", "describe"])
+    parser.add_argument("--orgs", type=int, default=2_000_000, help="Organizations to generate")
+    parser.add_argument("--grants", type=int, default=5_000_000, help="Grants to generate")
+    parser.add_argument("--funders", type=int, default=50_000, help="Organizations that make grants")
+    parser.add_argument("--tenants", type=int, default=4, help="Tenants with funnels")
+    parser.add_argument("--funnel-size", type=int, default=250_000, help="Entries in the largest funnel")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.database_url_sync)
+    existing = describe(engine)
+    if args.action == "describe":
+        print(asdict(existing) if existing else "No load-test dataset")
+    elif args.action == "drop":
+        drop(engine)
+    elif existing:
+        sys.exit(f"A load-test dataset already exists ({asdict(existing)}); drop it first")
+    else:
+        build(engine, args.orgs, args.grants, args.funders, args.tenants, args.funnel_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Check funnel listing query plans at scale: python -m benchmarks.funnel_plan
+
+Builds a synthetic funnel (1M entries by default, spread over a few tenants),
+then runs EXPLAIN ANALYZE on the exact statements ``list_funnel_entries``
+issues (built by ``funnel_listing``): first page and a cursor page, with and
+without a status filter, with and without ``expand=organization``. Each
+plan must read rows in order from the expected index (no Sort node) and finish
+within ``--max-ms``. Exits non-zero on any violation, so it can gate a CI job.
+All rows are written under a throwaway registry and tenant slugs and deleted
+afterwards.
+"""
+
+import argparse
+import sys
+import time
+import uuid
+from typing import Any
+
+from fastapi import Response
+from sqlalchemy import Engine, create_engine, delete, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.api.funnel import funnel_keyset, funnel_listing
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.config import settings
+from app.models.funnel_entry import FunnelEntry, FunnelStatus
+from app.models.organization import Organization
+from app.models.tenant import Tenant
+
+PAGE_SIZE = 50
+
+# Plan nodes that mean the rows were not read in index order.
+SORT_NODES = frozenset({"Sort", "Incremental Sort"})
+
+
+class Explain(Executable, ClauseElement):
+    """``EXPLAIN (ANALYZE, FORMAT JSON)`` around a statement, keeping its bind processing."""
+
+    inherit_cache = False
+
+    def __init__(self, stmt: Any):
+        self.stmt = stmt
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler: Any, **kw: Any) -> str:
+    return "EXPLAIN (ANALYZE, FORMAT JSON) " + compiler.process(element.stmt, **kw)
+
+
+def _nodes(plan: dict) -> list[dict]:
+    nodes = [plan]
+    for child in plan.get("Plans", []):
+        nodes.extend(_nodes(child))
+    return nodes
+
+
+def build_dataset(engine: Engine, registry: str, entries: int, tenants: int) -> list[uuid.UUID]:
+    """Create ``tenants`` tenants sharing ``entries // tenants`` organizations, one entry per pair."""
+    per_tenant = entries // tenants
+    with Session(engine) as session:
+        session.execute(
+            text(
+                "INSERT INTO organizations (id, name, registry, external_id) "
+                "SELECT gen_random_uuid(), 'Funnel Bench Org ' || i, :registry, lpad(i::text, 9, '0') "
+                "FROM generate_series(1, :n) AS i"
+            ),
+            {"registry": registry, "n": per_tenant},
+        )
+        tenant_rows = [Tenant(name=f"Funnel bench {i}", slug=f"{registry.lower()}-{i}") for i in range(tenants)]
+        session.add_all(tenant_rows)
+        session.flush()
+        tenant_ids = [tenant.id for tenant in tenant_rows]
+        for tenant_id in tenant_ids:
+            # Statuses skewed towards prospect, like real funnels; updated_at spread over a year.
+            session.execute(
+                text(
+                    "INSERT INTO funnel_entries (id, tenant_id, org_id, status, created_at, updated_at) "
+                    "SELECT gen_random_uuid(), :tenant_id, o.id, "
+                    "(enum_range(NULL::funnelstatus))[1 + floor(power(random(), 2) * 6)::int], ts, ts "
+                    "FROM organizations AS o, LATERAL (SELECT now() - random() * interval '365 days' AS ts) AS t "
+                    "WHERE o.registry = :registry"
+                ),
+                {"tenant_id": tenant_id, "registry": registry},
+            )
+        session.commit()
+        session.execute(text("ANALYZE funnel_entries"))
+        session.commit()
+    return tenant_ids
+
+
+def drop_dataset(engine: Engine, registry: str, tenant_ids: list[uuid.UUID]) -> None:
+    with Session(engine) as session:
+        if tenant_ids:
+            session.execute(delete(FunnelEntry).where(FunnelEntry.tenant_id.in_(tenant_ids)))
+            session.execute(delete(Tenant).where(Tenant.id.in_(tenant_ids)))
+        session.execute(delete(Organization).where(Organization.registry == registry))
+        session.commit()
+
+
+def check(engine: Engine, tenant_id: uuid.UUID, max_ms: float) -> list[str]:
+    failures = []
+    cases: list[tuple[FunnelStatus | None, str | None, str]] = [
+        (None, None, "ix_funnel_entries_tenant_updated_at_id"),
+        (FunnelStatus.researching, None, "ix_funnel_entries_tenant_status_updated_at_id"),
+        (None, "organization", "ix_funnel_entries_tenant_updated_at_id"),
+        (FunnelStatus.researching, "organization", "ix_funnel_entries_tenant_status_updated_at_id"),
+    ]
+    with Session(engine) as session:
+        for status, expand, expected_index in cases:
+            pages: list[tuple[str, str | None]] = [("first page", None)]
+            # A cursor from deep in the listing, to exercise the keyset predicate.
+            rows = session.execute(funnel_listing(tenant_id, status, expand, None, 0, PAGE_SIZE * 20)).all()
+            if len(rows) > 1:
+                response = Response()
+                funnel_keyset.page(rows, len(rows) - 1, response)
+                pages.append(("cursor page", response.headers[NEXT_CURSOR_HEADER]))
+
+            for page, cursor in pages:
+                label = f"status={status.value if status else 'any'}, expand={expand or 'none'}, {page}"
+                stmt = funnel_listing(tenant_id, status, expand, cursor, 0, PAGE_SIZE)
+                started = time.perf_counter()
+                (explain,) = session.execute(Explain(stmt)).scalar_one()
+                wall_ms = (time.perf_counter() - started) * 1000
+                nodes = _nodes(explain["Plan"])
+                node_types = [node["Node Type"] for node in nodes]
+                indexes = {node["Index Name"] for node in nodes if "Index Name" in node}
+                exec_ms = explain["Execution Time"]
+                ok = True
+                if SORT_NODES & set(node_types):
+                    failures.append(f"{label}: plan sorts ({' > '.join(node_types)})")
+                    ok = False
+                if expected_index not in indexes:
+                    failures.append(f"{label}: expected {expected_index}, plan used {sorted(indexes) or 'no index'}")
+                    ok = False
+                if exec_ms > max_ms:
+                    failures.append(f"{label}: {exec_ms:.2f} ms exceeds {max_ms} ms")
+                    ok = False
+                print(
+                    f"{'ok' if ok else 'FAIL':>4}  {label:<58} exec {exec_ms:7.2f} ms  "
+                    f"(round trip {wall_ms:6.2f} ms)  {' > '.join(node_types)}"
+                )
+    return failures
+
+
+def run(entries: int, tenants: int, max_ms: float) -> int:
+    engine = create_engine(settings.database_url_sync)
+    registry = f"FUNNELBENCH-{uuid.uuid4().hex[:8]}"
+    tenant_ids: list[uuid.UUID] = []
+    try:
+        started = time.perf_counter()
+        tenant_ids = build_dataset(engine, registry, entries, tenants)
+        print(f"Built {entries:,} entries over {tenants} tenants in {time.perf_counter() - started:.1f}s")
+        failures = check(engine, tenant_ids[0], max_ms)
+    finally:
+        drop_dataset(engine, registry, tenant_ids)
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check funnel listing query plans on a synthetic dataset")
+    parser.add_argument("--entries", type=int, default=1_000_000, help="Total funnel entries to generate")
+    parser.add_argument("--tenants", type=int, default=4, help="Tenants to spread the entries over")
+    parser.add_argument("--max-ms", type=float, default=10.0, help="Execution time budget per page")
+    args = parser.parse_args()
+    sys.exit(run(args.entries, args.tenants, args.max_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,434 @@
+"""Load-test the API and the indexer loader: python -m benchmarks.load
+
+Runs scripted scenarios against the dataset built by ``benchmarks.dataset``
+and reports p50/p95/p99 latency and throughput for each:
+
+- ``orgs_list``: walk the organization listing page by page (keyset cursors).
+- ``orgs_filter``: the organization listing filtered by a common name word.
+- ``orgs_search``: ranked name search for word pairs, some with typos.
+- ``funnel_list``: walk the largest funnel page by page.
+- ``funnel_expand``: funnel pages of 200 with a status filter and ``expand=organization``.
+- ``batch_get``: ``/api/organizations/batch-get`` for 200 random ids.
+- ``funnel_bulk``: ``/bulk`` upserts of ``--bulk-size`` entries into a scratch tenant.
+- ``load_records``: the indexer loader on synthetic batches of organizations
+  and power-law grants, timed per batch; throughput is in rows per second.
+
+HTTP scenarios run ``--requests`` requests over ``--concurrency`` concurrent
+clients after ``--warmup`` unmeasured ones. By default requests go to the app
+in-process through httpx's ASGI transport, so latency covers routing,
+database and serialization but not the HTTP server; pass ``--base-url`` to
+load a running server instead. Results are written as JSON to ``--output``;
+``--baseline`` prints the change against an earlier results file. The scratch
+tenant and everything ``load_records`` writes are deleted afterwards, giving
+summaries and pairs included, and the co-funding graph is invalidated; a
+``--base-url`` server sees that invalidation only if it shares ``CACHE_URL``.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+from sqlalchemy import Engine, create_engine, delete, or_, select
+from sqlalchemy.orm import Session
+
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.config import settings
+from app.models.funnel_entry import FunnelEntry, FunnelStatus
+from app.models.grant import Grant
+from app.models.organization import Organization
+from app.models.tenant import Tenant
+from app.services.cofunding import cofunding_graph
+from app.services.giving import apply_giving_deltas
+from app.services.response_cache import response_cache
+from benchmarks.dataset import FIRST_WORDS, REGISTRY, SECOND_WORDS, TENANT_SLUG_PREFIX, describe
+from indexer.base import RawGrant, RawOrganization, RawRecord
+from indexer.loader import load_records
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Random organization ids sampled up front for batch-get and bulk bodies.
+ID_SAMPLE_SIZE = 20_000
+
+
+@dataclass
+class ScenarioResult:
+    requests: int
+    errors: int
+    concurrency: int
+    seconds: float
+    throughput: float
+    throughput_unit: str
+    latency_ms: dict[str, float]
+
+
+@dataclass
+class Fixtures:
+    """Ids the scenarios need, looked up once before the run."""
+
+    funnel_tenant_id: uuid.UUID
+    bulk_tenant_id: uuid.UUID
+    org_ids: list[uuid.UUID]
+
+
+@dataclass
+class Walker:
+    """Per-client cursor state for scenarios that page through a listing."""
+
+    cursor: str | None = None
+    pages: int = 0
+
+
+# A request builder returns (method, url, json body) for the next request.
+RequestBuilder = Callable[[Walker, random.Random], tuple[str, str, object]]
+
+
+def latency_summary(samples: list[float]) -> dict[str, float]:
+    if not samples:
+        # Nothing measured (--requests 0, or an empty loader run).
+        return dict.fromkeys(("p50", "p95", "p99", "mean", "max"), 0.0)
+    cuts = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else samples * 99
+    return {
+        "p50": round(cuts[49] * 1000, 3),
+        "p95": round(cuts[94] * 1000, 3),
+        "p99": round(cuts[98] * 1000, 3),
+        "mean": round(statistics.fmean(samples) * 1000, 3),
+        "max": round(max(samples) * 1000, 3),
+    }
+
+
+def _typo(word: str, rng: random.Random) -> str:
+    i = rng.randrange(1, len(word) - 1)
+    return word[:i] + word[i + 1 :]
+
+
+def scenarios(fixtures: Fixtures, bulk_size: int) -> dict[str, RequestBuilder]:
+    funnel = f"/api/tenants/{fixtures.funnel_tenant_id}/funnel"
+    statuses = [status.value for status in FunnelStatus]
+
+    def paged(path: str) -> RequestBuilder:
+        def build(walker: Walker, rng: random.Random) -> tuple[str, str, object]:
+            # Restart from the first page every 20 pages, like users abandoning a listing.
+            if walker.pages % 20 == 0:
+                walker.cursor = None
+            walker.pages += 1
+            params = {"limit": 50, **({"cursor": walker.cursor} if walker.cursor else {})}
+            return "GET", str(httpx.URL(path, params=params)), None
+
+        return build
+
+    def orgs_filter(walker: Walker, rng: random.Random) -> tuple[str, str, object]:
+        word = rng.choice(FIRST_WORDS + SECOND_WORDS)
+        return "GET", str(httpx.URL("/api/organizations", params={"q": word, "limit": 50})), None
+
+    def orgs_search(walker: Walker, rng: random.Random) -> tuple[str, str, object]:
+        first, second = rng.choice(FIRST_WORDS), rng.choice(SECOND_WORDS)
+        if rng.random() < 0.3:
+            second = _typo(second, rng)
+        return "GET", str(httpx.URL("/api/organizations/search", params={"q": f"{first} {second}"})), None
+
+    def funnel_expand(walker: Walker, rng: random.Random) -> tuple[str, str, object]:
+        params = {"limit": 200, "status": rng.choice(statuses), "expand": "organization"}
+        return "GET", str(httpx.URL(funnel, params=params)), None
+
+    def batch_get(walker: Walker, rng: random.Random) -> tuple[str, str, object]:
+        ids = rng.sample(fixtures.org_ids, 200)
+        return "POST", "/api/organizations/batch-get", {"ids": [str(org_id) for org_id in ids]}
+
+    def funnel_bulk(walker: Walker, rng: random.Random) -> tuple[str, str, object]:
+        # Ids drawn from a fixed sample, so later batches mix inserts with updates.
+        org_ids = rng.sample(fixtures.org_ids, bulk_size)
+        body = [{"org_id": str(org_id), "status": rng.choice(statuses)} for org_id in org_ids]
+        return "POST", f"/api/tenants/{fixtures.bulk_tenant_id}/funnel/bulk?on_conflict=update", body
+
+    return {
+        "orgs_list": paged("/api/organizations"),
+        "orgs_filter": orgs_filter,
+        "orgs_search": orgs_search,
+        "funnel_list": paged(funnel),
+        "funnel_expand": funnel_expand,
+        "batch_get": batch_get,
+        "funnel_bulk": funnel_bulk,
+    }
+
+
+async def run_http(
+    client: httpx.AsyncClient, build: RequestBuilder, requests: int, concurrency: int, warmup: int, seed: int
+) -> ScenarioResult:
+    samples: list[float] = []
+    errors = 0
+
+    async def clients(total: int, measure: bool) -> None:
+        remaining = total
+
+        async def client_loop(index: int) -> None:
+            nonlocal remaining, errors
+            walker, rng = Walker(), random.Random(seed * 1000 + index + (concurrency if measure else 0))
+            while remaining > 0:
+                remaining -= 1
+                method, url, body = build(walker, rng)
+                started = time.perf_counter()
+                response = await client.request(method, url, json=body)
+                elapsed = time.perf_counter() - started
+                walker.cursor = response.headers.get(NEXT_CURSOR_HEADER)
+                if measure:
+                    samples.append(elapsed)
+                    errors += response.status_code >= 400
+
+        await asyncio.gather(*(client_loop(i) for i in range(concurrency)))
+
+    await clients(warmup, measure=False)
+    started = time.perf_counter()
+    await clients(requests, measure=True)
+    seconds = time.perf_counter() - started
+    return ScenarioResult(
+        requests=len(samples),
+        errors=errors,
+        concurrency=concurrency,
+        seconds=round(seconds, 3),
+        throughput=round(len(samples) / seconds, 1),
+        throughput_unit="requests/s",
+        latency_ms=latency_summary(samples),
+    )
+
+
+def loader_records(registry: str, batches: int, batch_size: int, grants_per_org: int, seed: int) -> Iterator[RawRecord]:
+    """Batches of new organizations plus grants to them from power-law-ranked funders."""
+    rng = random.Random(seed)
+    for batch in range(batches):
+        record = RawRecord()
+        start = batch * batch_size
+        for i in range(start, start + batch_size):
+            record.organizations.append(
+                RawOrganization(
+                    name=f"{rng.choice(FIRST_WORDS)} {rng.choice(SECOND_WORDS)} Loader {i}",
+                    registry=registry,
+                    external_id=f"{i:09d}",
+                    country="US",
+                    city=f"City {i % 5000}",
+                )
+            )
+        for _ in range(batch_size * grants_per_org):
+            funder = int(rng.random() ** 3 * (start + batch_size))
+            grantee = rng.randrange(start, start + batch_size)
+            if funder != grantee:
+                record.grants.append(
+                    RawGrant(
+                        funder_registry=registry,
+                        funder_external_id=f"{funder:09d}",
+                        grantee_registry=registry,
+                        grantee_external_id=f"{grantee:09d}",
+                        amount=rng.randrange(1, 500) * 1000,
+                        year=rng.randrange(2014, 2025),
+                        source="loadbench-loader",
+                    )
+                )
+        yield record
+
+
+def run_loader(engine: Engine, batches: int, batch_size: int, grants_per_org: int, seed: int) -> ScenarioResult:
+    registry = f"LOADBENCH-LOADER-{uuid.uuid4().hex[:8]}"
+    samples: list[float] = []
+    rows = 0
+
+    def timed(records: Iterator[RawRecord]) -> Iterator[RawRecord]:
+        # load_records commits each record before asking for the next one.
+        nonlocal rows
+        for record in records:
+            rows += len(record.organizations) + len(record.grants)
+            started = time.perf_counter()
+            yield record
+            samples.append(time.perf_counter() - started)
+
+    try:
+        started = time.perf_counter()
+        with Session(engine) as session:
+            load_records(session, timed(loader_records(registry, batches, batch_size, grants_per_org, seed)))
+        seconds = time.perf_counter() - started
+    finally:
+        with Session(engine) as session:
+            org_ids = select(Organization.id).where(Organization.registry == registry)
+            removed = session.execute(
+                delete(Grant)
+                .where(or_(Grant.funder_org_id.in_(org_ids), Grant.grantee_org_id.in_(org_ids)))
+                .returning(Grant.funder_org_id, Grant.grantee_org_id, Grant.amount, Grant.year)
+            ).tuples()
+            # Takes the grants back out of the funders' summaries and giving_pairs,
+            # and drops the scratch organizations' own summary rows.
+            apply_giving_deltas(session, removed, removed=True)
+            session.execute(delete(Organization).where(Organization.registry == registry))
+            session.commit()
+        response_cache.invalidate("organizations", "grants")
+        # Removed pairs only leave the co-funding graph on a rebuild. A server
+        # behind --base-url picks this up on its next refresh when it shares
+        # CACHE_URL with this process; otherwise restart it.
+        cofunding_graph.invalidate()
+    return ScenarioResult(
+        requests=len(samples),
+        errors=0,
+        concurrency=1,
+        seconds=round(seconds, 3),
+        throughput=round(rows / seconds, 1),
+        throughput_unit="rows/s",
+        latency_ms=latency_summary(samples),
+    )
+
+
+def prepare(engine: Engine, seed: int) -> Fixtures:
+    with Session(engine) as session:
+        funnel_tenant_id = session.execute(
+            select(Tenant.id).where(Tenant.slug == f"{TENANT_SLUG_PREFIX}1")
+        ).scalar_one()
+        # Random ids by rank through the (registry, external_id) index; no full scan.
+        (max_rank,) = session.execute(
+            select(Organization.external_id)
+            .where(Organization.registry == REGISTRY)
+            .order_by(Organization.external_id.desc())
+            .limit(1)
+        ).one()
+        rng = random.Random(seed)
+        ranks = [f"{rng.randint(1, int(max_rank)):09d}" for _ in range(ID_SAMPLE_SIZE)]
+        org_ids = list(
+            session.execute(
+                select(Organization.id).where(Organization.registry == REGISTRY, Organization.external_id.in_(ranks))
+            ).scalars()
+        )
+        bulk_tenant = Tenant(name="Load bench bulk", slug=f"loadbench-bulk-{uuid.uuid4().hex[:8]}")
+        session.add(bulk_tenant)
+        session.commit()
+        return Fixtures(funnel_tenant_id=funnel_tenant_id, bulk_tenant_id=bulk_tenant.id, org_ids=org_ids)
+
+
+def cleanup(engine: Engine, fixtures: Fixtures) -> None:
+    with Session(engine) as session:
+        session.execute(delete(FunnelEntry).where(FunnelEntry.tenant_id == fixtures.bulk_tenant_id))
+        session.execute(delete(Tenant).where(Tenant.id == fixtures.bulk_tenant_id))
+        session.commit()
+
+
+def _client(base_url: str | None) -> httpx.AsyncClient:
+    if base_url:
+        return httpx.AsyncClient(base_url=base_url, timeout=60)
+    from app.main import app
+
+    # Unhandled exceptions become 500s and count as errors, as they would against a server.
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    return httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60)
+
+
+async def run_all(args: argparse.Namespace, engine: Engine, fixtures: Fixtures) -> dict[str, ScenarioResult]:
+    builders = scenarios(fixtures, args.bulk_size)
+    results: dict[str, ScenarioResult] = {}
+    async with _client(args.base_url) as client:
+        for name in args.scenario:
+            if name == "load_records":
+                continue
+            results[name] = await run_http(
+                client, builders[name], args.requests, args.concurrency, args.warmup, args.seed
+            )
+            _print(name, results[name])
+    if "load_records" in args.scenario:
+        results["load_records"] = await asyncio.to_thread(
+            run_loader, engine, args.loader_batches, args.loader_batch_size, args.loader_grants_per_org, args.seed
+        )
+        _print("load_records", results["load_records"])
+    return results
+
+
+def _print(name: str, result: ScenarioResult) -> None:
+    latency = result.latency_ms
+    print(
+        f"{name:>14}: p50 {latency['p50']:8.2f} ms  p95 {latency['p95']:8.2f} ms  p99 {latency['p99']:8.2f} ms  "
+        f"{result.throughput:10,.1f} {result.throughput_unit}  ({result.requests} measured, {result.errors} errors)",
+        flush=True,
+    )
+
+
+def compare(results: dict[str, ScenarioResult], baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text())["scenarios"]
+    print(f"\nChange against {baseline_path}:")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        deltas = [
+            f"{key} {(result.latency_ms[key] / before['latency_ms'][key] - 1) * 100:+6.1f}%"
+            for key in ("p50", "p95", "p99")
+            if before["latency_ms"][key]
+        ]
+        deltas.append(f"throughput {(result.throughput / before['throughput'] - 1) * 100:+6.1f}%")
+        print(f"{name:>14}: {'  '.join(deltas)}")
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    names = [*scenarios(Fixtures(uuid.uuid4(), uuid.uuid4(), []), 0), "load_records"]
+    parser = argparse.ArgumentParser(description="Load-test the API and the indexer loader")
+    parser.add_argument("--scenario", action="append", choices=names, help="Scenario to run (repeatable; default all)")
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per HTTP scenario")
+    parser.add_argument("--warmup", type=int, default=50, help="Unmeasured requests before each HTTP scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients per HTTP scenario")
+    parser.add_argument("--bulk-size", type=int, default=500, help="Entries per funnel bulk request")
+    parser.add_argument("--loader-batches", type=int, default=50, help="Records passed to load_records")
+    parser.add_argument("--loader-batch-size", type=int, default=1000, help="Organizations per record")
+    parser.add_argument("--loader-grants-per-org", type=int, default=3, help="Grants per organization in a record")
+    parser.add_argument("--base-url", help="Load a running server instead of the in-process app")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for request parameters")
+    parser.add_argument("--output", type=Path, help="Results file (default benchmarks/results/load-<time>.json)")
+    parser.add_argument("--baseline", type=Path, help="Earlier results file to compare against")
+    args = parser.parse_args()
+    args.scenario = args.scenario or names
+
+    engine = create_engine(settings.database_url_sync)
+    dataset = describe(engine)
+    if dataset is None:
+        sys.exit("No load-test dataset; build one with: python -m benchmarks.dataset build")
+    print(f"Dataset: {asdict(dataset)}")
+
+    fixtures = prepare(engine, args.seed)
+    try:
+        results = asyncio.run(run_all(args, engine, fixtures))
+    finally:
+        cleanup(engine, fixtures)
+
+    started_at = datetime.now(timezone.utc)
+    output = args.output or RESULTS_DIR / f"load-{started_at:%Y%m%dT%H%M%SZ}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps(
+            {
+                "created_at": started_at.isoformat(),
+                "git_commit": _git_commit(),
+                "target": args.base_url or "in-process",
+                "dataset": asdict(dataset),
+                "config": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+                "scenarios": {name: asdict(result) for name, result in results.items()},
+            },
+            indent=2,
+        )
+    )
+    print(f"Results written to {output}")
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark the indexer loader: python -m benchmarks.loader
+
+Loads synthetic organizations twice (a cold insert pass, then an update pass)
+with the row-by-row loader the indexer used to ship and with the current
+set-based ``load_records``, and reports rows per second for each. All rows are
+written under throwaway registries and deleted afterwards.
+"""
+
+import argparse
+import time
+import uuid
+from collections.abc import Callable, Iterator
+
+from sqlalchemy import create_engine, delete, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.organization import Organization
+from indexer.base import RawOrganization, RawRecord
+from indexer.loader import load_records
+
+Loader = Callable[[Session, Iterator[RawRecord]], dict[str, int]]
+
+
+def _legacy_load_records(session: Session, records: Iterator[RawRecord]) -> dict[str, int]:
+    """The original one-SELECT-per-organization loader, kept as the baseline."""
+    stats = {"orgs_created": 0, "orgs_updated": 0, "grants_created": 0}
+    for record in records:
+        for raw in record.organizations:
+            existing = session.execute(
+                select(Organization).where(
+                    Organization.registry == raw.registry,
+                    Organization.external_id == raw.external_id,
+                )
+            ).scalar_one_or_none()
+            if existing:
+                existing.name = raw.name
+                existing.country = raw.country or existing.country
+                existing.website = raw.website or existing.website
+                existing.city = raw.city or existing.city
+                existing.region = raw.region or existing.region
+                stats["orgs_updated"] += 1
+            else:
+                session.add(
+                    Organization(
+                        name=raw.name,
+                        registry=raw.registry,
+                        external_id=raw.external_id,
+                        country=raw.country,
+                        website=raw.website,
+                        city=raw.city,
+                        region=raw.region,
+                    )
+                )
+                session.flush()
+                stats["orgs_created"] += 1
+        session.commit()
+    return stats
+
+
+def synthetic_records(registry: str, rows: int, batch_size: int, renamed: bool = False) -> Iterator[RawRecord]:
+    """Yield ``rows`` organizations under ``registry`` in batches of ``batch_size``."""
+    suffix = " (renamed)" if renamed else ""
+    for start in range(0, rows, batch_size):
+        record = RawRecord()
+        for i in range(start, min(start + batch_size, rows)):
+            record.organizations.append(
+                RawOrganization(
+                    name=f"Benchmark Org {i}{suffix}",
+                    registry=registry,
+                    external_id=f"{i:09d}",
+                    country="US",
+                    # Leave city empty on the update pass to exercise the COALESCE rule.
+                    city="" if renamed else f"City {i % 500}",
+                    region=f"S{i % 50:02d}",
+                )
+            )
+        yield record
+
+
+def _timed(loader: Loader, session: Session, records: Iterator[RawRecord], rows: int) -> tuple[float, dict[str, int]]:
+    started = time.perf_counter()
+    stats = loader(session, records)
+    elapsed = time.perf_counter() - started
+    return rows / elapsed if elapsed else float("inf"), stats
+
+
+def run(rows: int, batch_size: int) -> None:
+    engine = create_engine(settings.database_url_sync)
+    loaders: list[tuple[str, Loader]] = [
+        ("row-by-row", _legacy_load_records),
+        ("set-based", load_records),
+    ]
+    for label, loader in loaders:
+        registry = f"BENCH-{uuid.uuid4().hex[:8]}"
+        try:
+            with Session(engine) as session:
+                insert_rate, insert_stats = _timed(
+                    loader, session, synthetic_records(registry, rows, batch_size), rows
+                )
+            with Session(engine) as session:
+                update_rate, update_stats = _timed(
+                    loader, session, synthetic_records(registry, rows, batch_size, renamed=True), rows
+                )
+        finally:
+            with Session(engine) as session:
+                session.execute(delete(Organization).where(Organization.registry == registry))
+                session.commit()
+        print(f"{label:>10}: insert {insert_rate:10.0f} rows/s {insert_stats}")
+        print(f"{label:>10}: update {update_rate:10.0f} rows/s {update_stats}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the indexer loader")
+    parser.add_argument("--rows", type=int, default=20_000, help="Organizations per pass")
+    parser.add_argument("--batch-size", type=int, default=100, help="Organizations per RawRecord")
+    args = parser.parse_args()
+    run(args.rows, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
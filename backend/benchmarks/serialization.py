@@ -0,0 +1,182 @@
+"""Benchmark list response serialization: python -m benchmarks.serialization
+
+Compares the lean path of the hot read endpoints (column rows written by a
+precompiled ``TypeAdapter``, see ``app.api.serialization``) with the ORM path
+they used before (entities validated into ``response_model``), kept here as
+the baseline. Both run in-process on the same synthetic rows, one request at a
+time, and report API-process CPU time per request: routing, row decoding and
+serialization. Database time is spent in the Postgres server and excluded.
+All rows are written under a throwaway registry and tenant and deleted
+afterwards.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+from fastapi import Depends, FastAPI, Query, Response
+from sqlalchemy import Engine, any_, create_engine, delete, literal, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+
+from app.api.funnel import funnel_keyset
+from app.api.organizations import org_keyset
+from app.config import settings
+from app.db import get_db, get_read_db
+from app.main import app
+from app.metrics import MetricsMiddleware
+from app.models.funnel_entry import FunnelEntry
+from app.models.organization import Organization
+from app.models.tenant import Tenant
+from app.schemas.funnel_entry import FunnelEntryExpanded, FunnelEntryRead
+from app.schemas.organization import OrganizationBatchGet, OrganizationBatchResult, OrganizationRead
+
+legacy = FastAPI()
+# Same per-request instrumentation as the real app, so only the handlers differ.
+legacy.add_middleware(MetricsMiddleware)
+
+
+@legacy.get("/api/organizations", response_model=list[OrganizationRead])
+async def _legacy_list_organizations(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db),
+) -> list[Organization]:
+    stmt = org_keyset.apply(select(Organization), None, 0, limit)
+    result = await db.execute(stmt)
+    return org_keyset.page(list(result.scalars().all()), limit, response)
+
+
+@legacy.get(
+    "/api/tenants/{tenant_id}/funnel", response_model=list[FunnelEntryExpanded], response_model_exclude_unset=True
+)
+async def _legacy_list_funnel_entries(
+    tenant_id: uuid.UUID,
+    response: Response,
+    expand: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+) -> list[FunnelEntry] | list[FunnelEntryRead]:
+    await db.get(Tenant, tenant_id)
+    stmt = select(FunnelEntry).where(FunnelEntry.tenant_id == tenant_id)
+    if expand == "organization":
+        stmt = stmt.options(selectinload(FunnelEntry.organization))
+    stmt = funnel_keyset.apply(stmt, None, 0, limit)
+    result = await db.execute(stmt)
+    entries = funnel_keyset.page(list(result.scalars().all()), limit, response)
+    if expand == "organization":
+        return entries
+    return [FunnelEntryRead.model_validate(entry) for entry in entries]
+
+
+@legacy.post("/api/organizations/batch-get", response_model=OrganizationBatchResult)
+async def _legacy_batch_get(
+    body: OrganizationBatchGet,
+    db: AsyncSession = Depends(get_read_db),
+) -> OrganizationBatchResult:
+    ids = literal(list(set(body.ids)), ARRAY(Organization.id.type))
+    result = await db.execute(select(Organization).where(Organization.id == any_(ids)))
+    found = {org.id: org for org in result.scalars()}
+    return OrganizationBatchResult(
+        organizations=[found.get(org_id) for org_id in body.ids],
+        missing=[org_id for org_id in body.ids if org_id not in found],
+    )
+
+
+# (label, method, url, json body) per case; the url and body are built from the dataset.
+Case = tuple[str, str, str, object]
+
+
+def build_dataset(engine: Engine, registry: str, rows: int) -> tuple[uuid.UUID, list[uuid.UUID]]:
+    with Session(engine) as session:
+        org_ids = list(
+            session.execute(
+                text(
+                    "INSERT INTO organizations (id, name, registry, external_id, country, city, region, website) "
+                    "SELECT gen_random_uuid(), 'Serialization Bench Org ' || i, :registry, lpad(i::text, 9, '0'), "
+                    "'US', 'City ' || i % 500, 'S' || i % 50, 'https://example.org/' || i "
+                    "FROM generate_series(1, :n) AS i RETURNING id"
+                ),
+                {"registry": registry, "n": rows},
+            ).scalars()
+        )
+        tenant = Tenant(name="Serialization bench", slug=registry.lower())
+        session.add(tenant)
+        session.flush()
+        session.execute(
+            text(
+                "INSERT INTO funnel_entries (id, tenant_id, org_id, status) "
+                "SELECT gen_random_uuid(), :tenant_id, id, 'prospect' FROM organizations WHERE registry = :registry"
+            ),
+            {"tenant_id": tenant.id, "registry": registry},
+        )
+        session.commit()
+        return tenant.id, org_ids
+
+
+def drop_dataset(engine: Engine, registry: str, tenant_id: uuid.UUID | None) -> None:
+    with Session(engine) as session:
+        if tenant_id:
+            session.execute(delete(FunnelEntry).where(FunnelEntry.tenant_id == tenant_id))
+            session.execute(delete(Tenant).where(Tenant.id == tenant_id))
+        session.execute(delete(Organization).where(Organization.registry == registry))
+        session.commit()
+
+
+async def measure(target: FastAPI, case: Case, requests: int) -> tuple[float, float]:
+    """CPU and wall milliseconds per request for ``case`` against ``target``."""
+    _, method, url, body = case
+    transport = httpx.ASGITransport(app=target)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(10):
+            response = await client.request(method, url, json=body)
+            response.raise_for_status()
+        cpu, wall = time.process_time(), time.perf_counter()
+        for _ in range(requests):
+            await client.request(method, url, json=body)
+        cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    return cpu * 1000 / requests, wall * 1000 / requests
+
+
+async def compare(cases: list[Case], requests: int) -> None:
+    # One event loop for every case: pooled connections are bound to the loop that opened them.
+    for case in cases:
+        orm_cpu, orm_wall = await measure(legacy, case, requests)
+        lean_cpu, lean_wall = await measure(app, case, requests)
+        print(
+            f"{case[0]:>28}: CPU/request orm {orm_cpu:6.2f} ms, lean {lean_cpu:6.2f} ms "
+            f"({(1 - lean_cpu / orm_cpu) * 100:4.0f}% saved); wall {orm_wall:6.2f} -> {lean_wall:6.2f} ms"
+        )
+
+
+def run(rows: int, requests: int) -> None:
+    engine = create_engine(settings.database_url_sync)
+    registry = f"SERBENCH-{uuid.uuid4().hex[:8]}"
+    tenant_id = None
+    try:
+        tenant_id, org_ids = build_dataset(engine, registry, rows)
+        funnel = f"/api/tenants/{tenant_id}/funnel"
+        cases: list[Case] = [
+            ("organizations, limit=200", "GET", "/api/organizations?limit=200", None),
+            ("funnel, limit=200", "GET", f"{funnel}?limit=200", None),
+            ("funnel expanded, limit=200", "GET", f"{funnel}?limit=200&expand=organization", None),
+            ("batch-get, 1000 ids", "POST", "/api/organizations/batch-get", {"ids": [str(i) for i in org_ids[:1000]]}),
+        ]
+        asyncio.run(compare(cases, requests))
+    finally:
+        drop_dataset(engine, registry, tenant_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization, ORM vs lean")
+    parser.add_argument("--rows", type=int, default=5000, help="Organizations (and funnel entries) to generate")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per case and path")
+    args = parser.parse_args()
+    run(args.rows, args.requests)
+
+
+if __name__ == "__main__":
+    main()
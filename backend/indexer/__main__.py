@@ -8,8 +8,13 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from indexer.connectors.propublica import ProPublicaConnector
+from indexer.checkpoint import clear_checkpoint, get_checkpoint
+from indexer.connectors.irs_bulk import IRSBulkConnector
+from indexer.connectors.propublica import AsyncProPublicaConnector, ProPublicaConnector
+from indexer.copy_loader import copy_load_records
+from indexer.http_cache import ResponseCache
 from indexer.loader import load_records
+from indexer.pipeline import run_pipeline
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
 logger = logging.getLogger(__name__)
@@ -17,27 +22,111 @@ logger = logging.getLogger(__name__)
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Grant Funnel Indexer")
-    parser.add_argument("--source", choices=["propublica"], default="propublica")
+    parser.add_argument("--source", choices=["propublica", "irs-bulk"], default="propublica")
     parser.add_argument("--query", help="Search query for ProPublica")
     parser.add_argument("--eins", help="Comma-separated list of EINs to fetch")
     parser.add_argument("--max-pages", type=int, default=5, help="Max search result pages")
+    parser.add_argument("--bmf", action="append", default=[], help="IRS EO BMF CSV file (repeatable)")
+    parser.add_argument(
+        "--schedule-i", action="append", default=[], help="990 Schedule I grant extract CSV (repeatable)"
+    )
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per batch for bulk files")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Concurrent API requests; values above 1 use the async connector",
+    )
+    parser.add_argument("--rate", type=float, default=10.0, help="Max API requests per second (async connector)")
+    parser.add_argument(
+        "--mode",
+        choices=["upsert", "copy"],
+        default="upsert",
+        help="upsert: batched upserts per record; copy: COPY into staging tables (cold loads)",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=8,
+        help="Max items buffered between pipeline stages",
+    )
+    parser.add_argument("--cache-dir", help="Cache API responses on disk in this directory")
+    parser.add_argument("--cache-ttl", type=float, default=24.0, help="Hours before cached responses are revalidated")
+    parser.add_argument("--cache-max-mb", type=int, default=512, help="Max response cache size in MB")
+    parser.add_argument("--offline", action="store_true", help="Serve only from the response cache")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip work completed by a previous, interrupted run with the same arguments",
+    )
     args = parser.parse_args()
+    if args.resume and args.mode == "copy":
+        parser.error("--resume is not supported with --mode copy")
+    if args.offline and not args.cache_dir:
+        parser.error("--offline requires --cache-dir")
+
+    cache = None
+    if args.cache_dir:
+        cache = ResponseCache(
+            args.cache_dir,
+            ttl=args.cache_ttl * 3600,
+            max_bytes=args.cache_max_mb * 1024 * 1024,
+            offline=args.offline,
+        )
 
     if args.source == "propublica":
         ein_list = [e.strip() for e in args.eins.split(",")] if args.eins else None
-        connector = ProPublicaConnector(
-            search_query=args.query,
-            ein_list=ein_list,
-            max_pages=args.max_pages,
+        if args.concurrency > 1:
+            connector = AsyncProPublicaConnector(
+                search_query=args.query,
+                ein_list=ein_list,
+                max_pages=args.max_pages,
+                concurrency=args.concurrency,
+                rate=args.rate,
+                cache=cache,
+            )
+        else:
+            connector = ProPublicaConnector(
+                search_query=args.query,
+                ein_list=ein_list,
+                max_pages=args.max_pages,
+                cache=cache,
+            )
+    elif args.source == "irs-bulk":
+        connector = IRSBulkConnector(
+            bmf_paths=args.bmf,
+            schedule_i_paths=args.schedule_i,
+            chunk_size=args.chunk_size,
         )
     else:
         logger.error("Unknown source: %s", args.source)
         sys.exit(1)
 
     engine = create_engine(settings.database_url_sync)
-    with Session(engine) as session:
-        stats = load_records(session, connector.fetch())
-        logger.info("Import complete: %s", stats)
+    if args.mode == "copy":
+        stats = run_pipeline(
+            connector, lambda records: copy_load_records(engine, records), queue_size=args.queue_size
+        )
+    else:
+        key = connector.checkpoint_key
+        with Session(engine) as session:
+            if args.resume and key:
+                connector.start_position = get_checkpoint(session, key) or 0
+                logger.info("Resuming %s from position %d", key, connector.start_position)
+            stats = run_pipeline(
+                connector,
+                lambda records: load_records(session, records, checkpoint_key=key),
+                queue_size=args.queue_size,
+            )
+            if key:
+                # The run finished, so the next one starts from scratch.
+                clear_checkpoint(session, key)
+    logger.info("Import complete: %s", stats)
+    if cache is not None:
+        logger.info(
+            "Response cache: %d hits, %d revalidated, %d fetched",
+            cache.hits, cache.revalidated, cache.misses,
+        )
 
 
 if __name__ == "__main__":
@@ -2,6 +2,19 @@ from abc import ABC, abstractmethod
 from collections.abc import Iterator
 from dataclasses import dataclass, field
 from decimal import Decimal
+from typing import Any
+
+
+def normalize_ein(ein: object) -> str:
+    """An EIN as stored under the ``IRS`` registry: nine digits, zero-padded.
+
+    Sources disagree on the format (``43091431``, ``04-3091431``,
+    ``043091431``); every connector writing IRS keys goes through this so the
+    same organization always gets the same ``external_id``. Empty input stays
+    empty.
+    """
+    digits = str(ein if ein is not None else "").strip().replace("-", "")
+    return digits.zfill(9) if digits else ""
 
 
 @dataclass
@@ -30,10 +43,35 @@ class RawGrant:
 class RawRecord:
     organizations: list[RawOrganization] = field(default_factory=list)
     grants: list[RawGrant] = field(default_factory=list)
+    # Position to resume from once this record is committed (see BaseConnector).
+    checkpoint: int | None = None
 
 
 class BaseConnector(ABC):
+    """A data source for the indexer.
+
+    Resumable connectors set ``checkpoint_key`` to identify the unit of work
+    (e.g. source and query), tag records with ``RawRecord.checkpoint``, and
+    skip everything before ``start_position`` when fetching.
+    """
+
+    checkpoint_key: str | None = None
+    start_position: int = 0
+
     @abstractmethod
     def fetch(self) -> Iterator[RawRecord]:
         """Yield raw records from the data source."""
         pass
+
+    def fetch_raw(self) -> Iterator[Any]:
+        """Yield unparsed payloads; ``parse`` turns each one into a RawRecord.
+
+        Connectors that override both let the pipeline run network I/O and
+        parsing in separate stages. The default treats ``fetch`` output as
+        already parsed.
+        """
+        return self.fetch()
+
+    def parse(self, payload: Any) -> RawRecord:
+        """Convert one payload from ``fetch_raw`` into a RawRecord."""
+        return payload
@@ -0,0 +1,34 @@
+"""Checkpoints for resumable indexer runs.
+
+A checkpoint records how far a connector got for a given unit of work (its
+``checkpoint_key``). The loader saves it in the same transaction as the data
+it covers, so after a crash the stored position never runs ahead of what was
+committed.
+"""
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.indexer_checkpoint import IndexerCheckpoint
+
+
+def get_checkpoint(session: Session, key: str) -> int | None:
+    return session.execute(
+        select(IndexerCheckpoint.position).where(IndexerCheckpoint.key == key)
+    ).scalar_one_or_none()
+
+
+def save_checkpoint(session: Session, key: str, position: int) -> None:
+    """Stage the checkpoint in the current transaction; the caller commits."""
+    stmt = pg_insert(IndexerCheckpoint).values(key=key, position=position)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IndexerCheckpoint.key],
+        set_={"position": stmt.excluded.position, "updated_at": func.now()},
+    )
+    session.execute(stmt)
+
+
+def clear_checkpoint(session: Session, key: str) -> None:
+    session.execute(delete(IndexerCheckpoint).where(IndexerCheckpoint.key == key))
+    session.commit()
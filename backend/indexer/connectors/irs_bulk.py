@@ -0,0 +1,137 @@
+import csv
+import gzip
+import hashlib
+import logging
+from collections.abc import Iterator
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from pathlib import Path
+
+from indexer.base import BaseConnector, RawGrant, RawOrganization, RawRecord, normalize_ein
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_I_SOURCE = "irs-990-schedule-i"
+
+# Header names in Schedule I grant extracts. Extracts built from the 990
+# e-file XML vary; these match the IRS SOI naming and are compared
+# case-insensitively.
+SCHEDULE_I_COLUMNS = {
+    "funder_ein": "FILER_EIN",
+    "grantee_ein": "RECIPIENT_EIN",
+    "amount": "CASH_GRANT_AMT",
+    "year": "TAX_YEAR",
+}
+
+
+class IRSBulkConnector(BaseConnector):
+    """Import organizations and grants from local IRS bulk data files.
+
+    - bmf_paths: Exempt Organizations Business Master File CSVs (eo1.csv ... eo4.csv,
+      or the per-state files), yielding organizations
+    - schedule_i_paths: 990 Schedule I grant extracts, yielding grants
+
+    Files are read lazily in ``chunk_size``-row chunks, so memory stays bounded
+    by one chunk regardless of file size. Gzipped files (``.gz``) are read
+    transparently. BMF files are processed before Schedule I files so that
+    funders and grantees exist by the time their grants are loaded. Schedule I
+    rows without a recipient EIN cannot be matched to an organization and are
+    skipped. Checkpoints count completed chunks across all files.
+    """
+
+    def __init__(
+        self,
+        bmf_paths: list[str] | None = None,
+        schedule_i_paths: list[str] | None = None,
+        chunk_size: int = 5000,
+    ):
+        self.bmf_paths = [Path(p) for p in bmf_paths or []]
+        self.schedule_i_paths = [Path(p) for p in schedule_i_paths or []]
+        self.chunk_size = chunk_size
+
+    @property
+    def checkpoint_key(self) -> str | None:
+        paths = [str(p.resolve()) for p in self.bmf_paths + self.schedule_i_paths]
+        if not paths:
+            return None
+        digest = hashlib.sha1("\n".join(paths).encode()).hexdigest()[:16]
+        return f"irs-bulk:{digest}"
+
+    def fetch(self) -> Iterator[RawRecord]:
+        for payload in self.fetch_raw():
+            yield self.parse(payload)
+
+    def fetch_raw(self) -> Iterator[tuple[int, str, list[dict]]]:
+        """Yield (checkpoint, kind, rows) with at most ``chunk_size`` CSV rows each."""
+        position = 0
+        files = [("bmf", p) for p in self.bmf_paths] + [("schedule_i", p) for p in self.schedule_i_paths]
+        if not files:
+            logger.warning("No BMF or Schedule I files provided; nothing to read.")
+        for kind, path in files:
+            logger.info("Reading %s file %s", kind, path)
+            for rows in self._chunks(path):
+                position += 1
+                if position <= self.start_position:
+                    continue
+                yield position, kind, rows
+
+    def parse(self, payload: tuple[int, str, list[dict]]) -> RawRecord:
+        checkpoint, kind, rows = payload
+        record = RawRecord(checkpoint=checkpoint)
+        if kind == "bmf":
+            record.organizations = [org for row in rows if (org := self._parse_bmf_row(row))]
+        else:
+            record.grants = [grant for row in rows if (grant := self._parse_schedule_i_row(row))]
+        return record
+
+    def _chunks(self, path: Path) -> Iterator[list[dict]]:
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", newline="", encoding="utf-8", errors="replace") as f:
+            reader = csv.DictReader(f)
+            # Normalise headers once so lookups are case-insensitive.
+            reader.fieldnames = [name.strip().upper() for name in reader.fieldnames or []]
+            while rows := list(islice(reader, self.chunk_size)):
+                yield rows
+
+    def _parse_bmf_row(self, row: dict) -> RawOrganization | None:
+        ein = normalize_ein(row.get("EIN"))
+        name = (row.get("NAME") or "").strip()
+        if not ein or not name:
+            return None
+        return RawOrganization(
+            name=name,
+            registry="IRS",
+            external_id=ein,
+            country="US",
+            city=(row.get("CITY") or "").strip(),
+            region=(row.get("STATE") or "").strip(),
+        )
+
+    def _parse_schedule_i_row(self, row: dict) -> RawGrant | None:
+        funder_ein = normalize_ein(row.get(SCHEDULE_I_COLUMNS["funder_ein"]))
+        grantee_ein = normalize_ein(row.get(SCHEDULE_I_COLUMNS["grantee_ein"]))
+        if not funder_ein or not grantee_ein:
+            return None
+        return RawGrant(
+            funder_registry="IRS",
+            funder_external_id=funder_ein,
+            grantee_registry="IRS",
+            grantee_external_id=grantee_ein,
+            amount=_decimal(row.get(SCHEDULE_I_COLUMNS["amount"])),
+            year=_int(row.get(SCHEDULE_I_COLUMNS["year"])),
+            source=SCHEDULE_I_SOURCE,
+        )
+
+
+def _decimal(value: str | None) -> Decimal | None:
+    try:
+        return Decimal(value.strip().replace(",", "")) if value and value.strip() else None
+    except InvalidOperation:
+        return None
+
+
+def _int(value: str | None) -> int | None:
+    try:
+        return int(value.strip()[:4]) if value and value.strip() else None
+    except ValueError:
+        return None
@@ -1,9 +1,15 @@
+import asyncio
+import hashlib
 import logging
-from collections.abc import Iterator
+import queue
+import threading
+from collections.abc import AsyncIterator, Awaitable, Iterator
 
 import httpx
 
-from indexer.base import BaseConnector, RawOrganization, RawRecord
+from indexer.base import BaseConnector, RawOrganization, RawRecord, normalize_ein
+from indexer.http import HTTP2_AVAILABLE, RateLimitedTransport, TokenBucket, get_with_retry
+from indexer.http_cache import AsyncCachingTransport, CachingTransport, OfflineCacheMiss, ResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +22,11 @@ class ProPublicaConnector(BaseConnector):
     Supports two modes:
     - search: search for orgs by keyword (paginated)
     - ein_list: fetch specific orgs by EIN
+
+    Checkpoints count completed pages (search) or EINs (ein_list). With a
+    ``cache``, responses are served from and stored in a ResponseCache; in
+    offline mode uncached EINs are skipped and a search stops at the first
+    uncached page.
     """
 
     def __init__(
@@ -23,13 +34,30 @@ class ProPublicaConnector(BaseConnector):
         search_query: str | None = None,
         ein_list: list[str] | None = None,
         max_pages: int = 5,
+        cache: ResponseCache | None = None,
     ):
         self.search_query = search_query
         self.ein_list = ein_list or []
         self.max_pages = max_pages
+        self.cache = cache
+
+    @property
+    def checkpoint_key(self) -> str | None:
+        if self.ein_list:
+            digest = hashlib.sha1(",".join(self.ein_list).encode()).hexdigest()[:16]
+            return f"propublica:eins:{digest}"
+        if self.search_query:
+            return f"propublica:search:{self.search_query}"
+        return None
 
     def fetch(self) -> Iterator[RawRecord]:
-        with httpx.Client(timeout=30) as client:
+        for payload in self.fetch_raw():
+            yield self.parse(payload)
+
+    def fetch_raw(self) -> Iterator[tuple[int, list[dict]]]:
+        """Yield (checkpoint, organization JSON objects), one per API response."""
+        transport = CachingTransport(self.cache) if self.cache is not None else None
+        with httpx.Client(timeout=30, transport=transport) as client:
             if self.ein_list:
                 yield from self._fetch_by_ein(client)
             elif self.search_query:
@@ -37,42 +65,221 @@ class ProPublicaConnector(BaseConnector):
             else:
                 logger.warning("No search_query or ein_list provided; nothing to fetch.")
 
-    def _fetch_by_search(self, client: httpx.Client) -> Iterator[RawRecord]:
-        for page in range(self.max_pages):
+    def parse(self, payload: tuple[int, list[dict]]) -> RawRecord:
+        checkpoint, orgs = payload
+        return RawRecord(
+            organizations=[self._parse_org(org_data) for org_data in orgs],
+            checkpoint=checkpoint,
+        )
+
+    def _fetch_by_search(self, client: httpx.Client) -> Iterator[tuple[int, list[dict]]]:
+        for page in range(self.start_position, self.max_pages):
             url = f"{PROPUBLICA_API}/search.json"
             params = {"q": self.search_query, "page": page}
             logger.info("Searching ProPublica: query=%s page=%d", self.search_query, page)
-            resp = client.get(url, params=params)
+            try:
+                resp = client.get(url, params=params)
+            except OfflineCacheMiss:
+                logger.warning("Search page %d not cached; stopping (offline)", page)
+                break
             resp.raise_for_status()
             data = resp.json()
             orgs = data.get("organizations", [])
             if not orgs:
                 break
-            record = RawRecord()
-            for org_data in orgs:
-                record.organizations.append(self._parse_org(org_data))
-            yield record
+            yield page + 1, orgs
 
-    def _fetch_by_ein(self, client: httpx.Client) -> Iterator[RawRecord]:
-        for ein in self.ein_list:
+    def _fetch_by_ein(self, client: httpx.Client) -> Iterator[tuple[int, list[dict]]]:
+        for index in range(self.start_position, len(self.ein_list)):
+            ein = self.ein_list[index]
             url = f"{PROPUBLICA_API}/organizations/{ein}.json"
             logger.info("Fetching ProPublica org: EIN=%s", ein)
-            resp = client.get(url)
+            try:
+                resp = client.get(url)
+            except OfflineCacheMiss:
+                logger.warning("EIN %s not cached; skipping (offline)", ein)
+                continue
             if resp.status_code == 404:
                 logger.warning("EIN %s not found in ProPublica", ein)
+                # Still report progress so a resumed run does not retry it.
+                yield index + 1, []
                 continue
             resp.raise_for_status()
-            data = resp.json().get("organization", {})
-            record = RawRecord(organizations=[self._parse_org(data)])
-            yield record
+            yield index + 1, [resp.json().get("organization", {})]
 
     def _parse_org(self, data: dict) -> RawOrganization:
-        ein = str(data.get("ein", "")).strip()
         return RawOrganization(
             name=data.get("name", "").strip(),
             registry="IRS",
-            external_id=ein,
+            external_id=normalize_ein(data.get("ein")),
             country="US",
             city=data.get("city", ""),
             region=data.get("state", ""),
         )
+
+
+class AsyncProPublicaConnector(ProPublicaConnector):
+    """Concurrent variant of :class:`ProPublicaConnector`.
+
+    Keeps up to ``concurrency`` requests in flight on one pooled
+    ``httpx.AsyncClient`` (HTTP/2 when ``h2`` is installed), throttled by a
+    token bucket at ``rate`` requests per second, with jittered retries on
+    429/5xx. ``fetch_raw()`` runs the event loop in a background thread and
+    hands payloads over through a bounded queue, so loading overlaps with
+    fetching. Payloads are yielded in completion order, not request order;
+    checkpoints only cover the contiguous prefix of completed work.
+    """
+
+    def __init__(
+        self,
+        search_query: str | None = None,
+        ein_list: list[str] | None = None,
+        max_pages: int = 5,
+        concurrency: int = 16,
+        rate: float = 10.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+        cache: ResponseCache | None = None,
+    ):
+        super().__init__(search_query=search_query, ein_list=ein_list, max_pages=max_pages, cache=cache)
+        self.concurrency = concurrency
+        self.rate = rate
+        self.transport = transport
+
+    def fetch_raw(self) -> Iterator[tuple[int, list[dict]]]:
+        payloads: queue.Queue = queue.Queue(maxsize=self.concurrency * 2)
+        done = object()
+        stop = threading.Event()
+
+        async def pump() -> None:
+            async for payload in self.afetch_raw():
+                await asyncio.to_thread(payloads.put, payload)
+                if stop.is_set():
+                    return
+
+        def run() -> None:
+            try:
+                asyncio.run(pump())
+            except BaseException as exc:  # surfaced to the consumer below
+                payloads.put(exc)
+            finally:
+                payloads.put(done)
+
+        thread = threading.Thread(target=run, name="propublica-fetch", daemon=True)
+        thread.start()
+        try:
+            while (item := payloads.get()) is not done:
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            # Unblock a producer waiting on a full queue so the thread can exit.
+            while thread.is_alive():
+                try:
+                    payloads.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+    async def afetch(self) -> AsyncIterator[RawRecord]:
+        async for payload in self.afetch_raw():
+            yield self.parse(payload)
+
+    async def afetch_raw(self) -> AsyncIterator[tuple[int, list[dict]]]:
+        limits = httpx.Limits(
+            max_connections=self.concurrency, max_keepalive_connections=self.concurrency
+        )
+        transport: httpx.AsyncBaseTransport = RateLimitedTransport(
+            self.transport or httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE, limits=limits),
+            TokenBucket(self.rate),
+        )
+        if self.cache is not None:
+            transport = AsyncCachingTransport(self.cache, transport)
+        async with httpx.AsyncClient(timeout=30, transport=transport) as client:
+            if self.ein_list:
+                progress = _Watermark(self.start_position)
+                pending = (
+                    self._afetch_ein(client, index)
+                    for index in range(self.start_position, len(self.ein_list))
+                )
+                async for index, orgs in self._windowed(pending):
+                    yield progress.complete(index), orgs
+            elif self.search_query:
+                async for payload in self._afetch_by_search(client):
+                    yield payload
+            else:
+                logger.warning("No search_query or ein_list provided; nothing to fetch.")
+
+    async def _windowed(self, coros: Iterator[Awaitable]) -> AsyncIterator:
+        """Run ``coros`` at most ``concurrency`` at a time, yielding results as they finish."""
+        in_flight: set[asyncio.Task] = set()
+        try:
+            for coro in coros:
+                in_flight.add(asyncio.ensure_future(coro))
+                if len(in_flight) >= self.concurrency:
+                    finished, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    for task in finished:
+                        yield task.result()
+            while in_flight:
+                finished, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    yield task.result()
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    async def _afetch_by_search(self, client: httpx.AsyncClient) -> AsyncIterator[tuple[int, list[dict]]]:
+        url = f"{PROPUBLICA_API}/search.json"
+        # Results end at the first empty page; pages fetched past it are discarded.
+        last_page = self.max_pages
+        progress = _Watermark(self.start_position)
+
+        async def fetch_page(page: int) -> tuple[int, list[dict]]:
+            logger.info("Searching ProPublica: query=%s page=%d", self.search_query, page)
+            try:
+                resp = await get_with_retry(
+                    client, url, params={"q": self.search_query, "page": page}
+                )
+            except OfflineCacheMiss:
+                logger.warning("Search page %d not cached; stopping (offline)", page)
+                return page, []
+            resp.raise_for_status()
+            return page, resp.json().get("organizations", [])
+
+        pages = (fetch_page(page) for page in range(self.start_position, self.max_pages))
+        async for page, orgs in self._windowed(pages):
+            position = progress.complete(page)
+            if not orgs:
+                last_page = min(last_page, page)
+                continue
+            if page < last_page:
+                yield position, orgs
+
+    async def _afetch_ein(self, client: httpx.AsyncClient, index: int) -> tuple[int, list[dict]]:
+        ein = self.ein_list[index]
+        url = f"{PROPUBLICA_API}/organizations/{ein}.json"
+        logger.info("Fetching ProPublica org: EIN=%s", ein)
+        try:
+            resp = await get_with_retry(client, url)
+        except OfflineCacheMiss:
+            logger.warning("EIN %s not cached; skipping (offline)", ein)
+            return index, []
+        if resp.status_code == 404:
+            logger.warning("EIN %s not found in ProPublica", ein)
+            return index, []
+        resp.raise_for_status()
+        return index, [resp.json().get("organization", {})]
+
+
+class _Watermark:
+    """Track the contiguous prefix of completed positions when work finishes out of order."""
+
+    def __init__(self, start: int):
+        self.position = start
+        self._done: set[int] = set()
+
+    def complete(self, index: int) -> int:
+        self._done.add(index)
+        while self.position in self._done:
+            self._done.remove(self.position)
+            self.position += 1
+        return self.position
@@ -0,0 +1,196 @@
+"""Bulk ingest through PostgreSQL COPY, for cold loads of very large datasets.
+
+Records are streamed into temporary staging tables with ``COPY FROM STDIN`` in
+fixed-size chunks, then merged into ``organizations`` and ``grants`` with one
+set-based statement each. The inserted grants are added to the giving
+summaries with the same ordered deltas ``load_records`` applies, so a small
+incremental COPY only touches the organizations it loaded. Memory use is
+bounded by ``COPY_CHUNK_ROWS`` no matter how many records the connector yields.
+"""
+
+import csv
+import io
+import logging
+from collections.abc import Iterator
+
+from sqlalchemy import Engine, text
+
+from app.services.giving import apply_staged_giving_deltas
+from app.services.response_cache import response_cache
+from indexer.base import RawRecord
+
+logger = logging.getLogger(__name__)
+
+# Rows buffered per staging table before a COPY is issued.
+COPY_CHUNK_ROWS = 50_000
+
+# Written for None so that empty strings survive the round trip.
+_NULL = r"\N"
+
+STAGE_ORGS = "indexer_stage_organizations"
+STAGE_GRANTS = "indexer_stage_grants"
+STAGE_INSERTED = "indexer_stage_inserted_grants"
+
+ORG_COLUMNS = ("name", "registry", "external_id", "country", "website", "city", "region")
+GRANT_COLUMNS = (
+    "funder_registry",
+    "funder_external_id",
+    "grantee_registry",
+    "grantee_external_id",
+    "amount",
+    "year",
+    "source",
+)
+
+# Temporary tables are private to the loading transaction, so concurrent
+# runs cannot see each other's rows, and they are dropped at commit.
+_CREATE_STAGING = [
+    f"""
+    CREATE TEMP TABLE {STAGE_ORGS} (
+        seq bigserial,
+        name text NOT NULL,
+        registry text,
+        external_id text,
+        country text,
+        website text,
+        city text,
+        region text
+    ) ON COMMIT DROP
+    """,
+    f"""
+    CREATE TEMP TABLE {STAGE_GRANTS} (
+        funder_registry text,
+        funder_external_id text,
+        grantee_registry text,
+        grantee_external_id text,
+        amount numeric,
+        year integer,
+        source text
+    ) ON COMMIT DROP
+    """,
+    f"""
+    CREATE TEMP TABLE {STAGE_INSERTED} (
+        funder_org_id uuid,
+        grantee_org_id uuid,
+        amount numeric,
+        year integer
+    ) ON COMMIT DROP
+    """,
+]
+
+# Duplicate keys in the staging table fold the way ``load_records`` folds them:
+# the last row copied sets the name, and each optional field takes the last
+# non-empty value staged for it. Stored values are kept for fields left empty.
+_MERGE_ORGS = f"""
+WITH upserted AS (
+    INSERT INTO organizations (id, name, registry, external_id, country, website, city, region)
+    SELECT
+        gen_random_uuid(),
+        (array_agg(name ORDER BY seq DESC))[1],
+        registry,
+        external_id,
+        (array_agg(country ORDER BY seq DESC) FILTER (WHERE country <> ''))[1],
+        (array_agg(website ORDER BY seq DESC) FILTER (WHERE website <> ''))[1],
+        (array_agg(city ORDER BY seq DESC) FILTER (WHERE city <> ''))[1],
+        (array_agg(region ORDER BY seq DESC) FILTER (WHERE region <> ''))[1]
+    FROM {STAGE_ORGS}
+    GROUP BY registry, external_id
+    ON CONFLICT (registry, external_id) DO UPDATE SET
+        name = EXCLUDED.name,
+        country = COALESCE(NULLIF(EXCLUDED.country, ''), organizations.country),
+        website = COALESCE(NULLIF(EXCLUDED.website, ''), organizations.website),
+        city = COALESCE(NULLIF(EXCLUDED.city, ''), organizations.city),
+        region = COALESCE(NULLIF(EXCLUDED.region, ''), organizations.region),
+        updated_at = now()
+    RETURNING (xmax = 0) AS inserted
+)
+SELECT count(*) FILTER (WHERE inserted) AS created FROM upserted
+"""
+
+# The inserted grants' figures are kept for the giving deltas.
+_MERGE_GRANTS = f"""
+WITH inserted AS (
+    INSERT INTO grants (id, funder_org_id, grantee_org_id, amount, year, source)
+    SELECT gen_random_uuid(), funder.id, grantee.id, s.amount, s.year, s.source
+    FROM {STAGE_GRANTS} s
+    JOIN organizations funder
+        ON funder.registry = s.funder_registry AND funder.external_id = s.funder_external_id
+    JOIN organizations grantee
+        ON grantee.registry = s.grantee_registry AND grantee.external_id = s.grantee_external_id
+    RETURNING funder_org_id, grantee_org_id, amount, year
+)
+INSERT INTO {STAGE_INSERTED} SELECT * FROM inserted
+"""
+
+
+class _CopyBuffer:
+    """Accumulate CSV rows for one staging table and COPY them out when full."""
+
+    def __init__(self, cursor, table: str, columns: tuple[str, ...]):
+        self.cursor = cursor
+        self.sql = (
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN "
+            f"WITH (FORMAT csv, NULL '{_NULL}')"
+        )
+        self.rows = 0
+        self.total = 0
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf)
+
+    def add(self, values: tuple) -> None:
+        self._writer.writerow(_NULL if v is None else v for v in values)
+        self.rows += 1
+        if self.rows >= COPY_CHUNK_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        self._buf.seek(0)
+        self.cursor.copy_expert(self.sql, self._buf)
+        self.total += self.rows
+        self.rows = 0
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf)
+
+
+def copy_load_records(engine: Engine, records: Iterator[RawRecord]) -> dict[str, int]:
+    """Load raw records via COPY into staging tables and a set-based merge.
+
+    Returns counts keyed like ``load_records``, which counts every staged
+    organization that did not create a row as updated, duplicates included.
+    Grants whose funder or grantee is unknown after the merge are skipped and
+    reported in the log. The loaded grants are added to the giving summaries
+    in the same transaction.
+    """
+    with engine.begin() as conn:
+        for stmt in _CREATE_STAGING:
+            conn.execute(text(stmt))
+
+        cursor = conn.connection.cursor()
+        try:
+            orgs = _CopyBuffer(cursor, STAGE_ORGS, ORG_COLUMNS)
+            grants = _CopyBuffer(cursor, STAGE_GRANTS, GRANT_COLUMNS)
+            for record in records:
+                for raw in record.organizations:
+                    orgs.add(tuple(getattr(raw, c) for c in ORG_COLUMNS))
+                for raw in record.grants:
+                    grants.add(tuple(getattr(raw, c) for c in GRANT_COLUMNS))
+            orgs.flush()
+            grants.flush()
+        finally:
+            cursor.close()
+        logger.info("Staged %d organizations and %d grants", orgs.total, grants.total)
+
+        created = conn.execute(text(_MERGE_ORGS)).scalar_one()
+        grants_created = conn.execute(text(_MERGE_GRANTS)).rowcount
+        if grants_created < grants.total:
+            logger.warning("Skipped %d grants — org not found", grants.total - grants_created)
+        if grants_created:
+            apply_staged_giving_deltas(conn, STAGE_INSERTED)
+
+    if orgs.total:
+        response_cache.invalidate("organizations")
+    if grants_created:
+        response_cache.invalidate("grants")
+    return {"orgs_created": created, "orgs_updated": orgs.total - created, "grants_created": grants_created}
@@ -0,0 +1,101 @@
+"""Shared HTTP helpers for connectors: rate limiting and retries."""
+
+import asyncio
+import importlib.util
+import logging
+import random
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# httpx only speaks HTTP/2 when the optional h2 package is installed.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class TokenBucket:
+    """Async token-bucket rate limiter.
+
+    Allows bursts of up to ``capacity`` requests and a sustained ``rate``
+    requests per second across all tasks sharing the bucket.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """Acquire a token from ``limiter`` before every request reaching ``transport``.
+
+    Sits below any caching transport so cache hits are not throttled.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, limiter: TokenBucket):
+        self.transport = transport
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.limiter.acquire()
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def _retry_delay(attempt: int, backoff: float, max_backoff: float, resp: httpx.Response | None) -> float:
+    if resp is not None:
+        retry_after = resp.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), max_backoff)
+    # Full jitter: spreads retries from concurrent tasks instead of syncing them up.
+    return random.uniform(0, min(max_backoff, backoff * 2**attempt))
+
+
+async def get_with_retry(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    params: dict | None = None,
+    retries: int = 5,
+    backoff: float = 0.5,
+    max_backoff: float = 30.0,
+) -> httpx.Response:
+    """GET ``url``, retrying 429/5xx responses and transport errors with jittered backoff.
+
+    Returns the last response once retries are exhausted; callers decide how to
+    treat its status. Transport errors are re-raised after the final attempt.
+    """
+    for attempt in range(retries + 1):
+        resp: httpx.Response | None = None
+        try:
+            resp = await client.get(url, params=params)
+        except httpx.TransportError as exc:
+            if attempt == retries:
+                raise
+            logger.warning("GET %s failed (%s); retrying", url, exc)
+        else:
+            if resp.status_code not in RETRY_STATUSES or attempt == retries:
+                return resp
+            logger.warning("GET %s returned %d; retrying", url, resp.status_code)
+        await asyncio.sleep(_retry_delay(attempt, backoff, max_backoff, resp))
+    raise AssertionError("unreachable")
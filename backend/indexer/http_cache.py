@@ -0,0 +1,251 @@
+"""On-disk HTTP response cache for connectors.
+
+``CachingTransport`` / ``AsyncCachingTransport`` wrap an httpx transport and
+serve GET responses from a ``ResponseCache`` directory. Entries are fresh for
+``ttl`` seconds; after that they are revalidated with a conditional GET
+(``If-None-Match`` / ``If-Modified-Since``) when the origin sent validators,
+so an unchanged resource costs a 304 instead of a full download. In offline
+mode the network is never touched and misses raise ``OfflineCacheMiss``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+CACHEABLE_STATUSES = frozenset({200, 404})
+
+# Hop-by-hop and encoding headers that no longer describe the stored (decoded) body.
+_DROP_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection"})
+
+
+class OfflineCacheMiss(httpx.RequestError):
+    """Raised in offline mode for a request that is not in the cache."""
+
+
+@dataclass
+class CacheEntry:
+    status_code: int
+    headers: list[tuple[str, str]]
+    body: bytes
+    stored_at: float
+
+    @property
+    def etag(self) -> str | None:
+        return self._header("etag")
+
+    @property
+    def last_modified(self) -> str | None:
+        return self._header("last-modified")
+
+    def _header(self, name: str) -> str | None:
+        for key, value in self.headers:
+            if key.lower() == name:
+                return value
+        return None
+
+    def to_response(self, request: httpx.Request, cache_status: str) -> httpx.Response:
+        return httpx.Response(
+            self.status_code,
+            headers=self.headers + [("X-Cache", cache_status)],
+            content=self.body,
+            request=request,
+        )
+
+
+class ResponseCache:
+    """Directory of cached responses keyed by method and full URL (including params).
+
+    Each entry is one file: a JSON header line followed by the body. Reads
+    refresh the file's mtime, and the least recently used entries are evicted
+    once the directory grows past ``max_bytes``. Expired entries without
+    validators cannot be revalidated and are dropped during pruning.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        ttl: float = 24 * 3600,
+        max_bytes: int = 512 * 1024 * 1024,
+        offline: bool = False,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._size = sum(p.stat().st_size for p in self._files())
+        self.prune()
+
+    @staticmethod
+    def key(request: httpx.Request) -> str:
+        return hashlib.sha256(f"{request.method} {request.url}".encode()).hexdigest()
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.stored_at < self.ttl
+
+    def get(self, key: str) -> CacheEntry | None:
+        path = self._path(key)
+        entry = self._read(path)
+        if entry is not None:
+            os.utime(path)
+        return entry
+
+    def _read(self, path: Path) -> CacheEntry | None:
+        try:
+            with path.open("rb") as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+        except (FileNotFoundError, ValueError):
+            return None
+        return CacheEntry(
+            status_code=meta["status_code"],
+            headers=[tuple(h) for h in meta["headers"]],
+            body=body,
+            stored_at=meta["stored_at"],
+        )
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        path = self._path(key)
+        meta = {"status_code": entry.status_code, "headers": entry.headers, "stored_at": entry.stored_at}
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(json.dumps(meta).encode() + b"\n")
+            f.write(entry.body)
+        old_size = path.stat().st_size if path.exists() else 0
+        os.replace(tmp, path)
+        self._size += path.stat().st_size - old_size
+        if self._size > self.max_bytes:
+            self.prune()
+
+    def prune(self) -> None:
+        """Drop unrevalidatable expired entries, then evict LRU entries down to 90% of the cap."""
+        files = sorted(self._files(), key=lambda p: p.stat().st_mtime)
+        for path in list(files):
+            entry = self._read(path)
+            if entry and not self.is_fresh(entry) and not (entry.etag or entry.last_modified):
+                files.remove(path)
+                self._remove(path)
+        target = self.max_bytes * 0.9
+        for path in files:
+            if self._size <= target:
+                break
+            self._remove(path)
+
+    def store_response(self, key: str, response: httpx.Response, body: bytes) -> CacheEntry:
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS]
+        entry = CacheEntry(response.status_code, headers, body, time.time())
+        if response.status_code in CACHEABLE_STATUSES:
+            self.put(key, entry)
+        return entry
+
+    def refresh(self, key: str, entry: CacheEntry) -> CacheEntry:
+        entry.stored_at = time.time()
+        self.put(key, entry)
+        return entry
+
+    def conditional_headers(self, entry: CacheEntry) -> dict[str, str]:
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def lookup(self, request: httpx.Request) -> tuple[str, CacheEntry | None, httpx.Response | None]:
+        """Shared front half of both transports, for GET requests.
+
+        Returns the key, any stored entry, and a response when the request can
+        be answered without the network. Conditional headers are added to
+        ``request`` when the stored entry needs revalidating.
+        """
+        key = self.key(request)
+        entry = self.get(key)
+        if entry is not None and (self.offline or self.is_fresh(entry)):
+            self.hits += 1
+            return key, entry, entry.to_response(request, "HIT")
+        if self.offline:
+            self.misses += 1
+            raise OfflineCacheMiss(f"Not cached (offline mode): {request.url}", request=request)
+        if entry is not None:
+            request.headers.update(self.conditional_headers(entry))
+        return key, entry, None
+
+    def complete(
+        self, key: str, entry: CacheEntry | None, request: httpx.Request, response: httpx.Response, body: bytes
+    ) -> httpx.Response:
+        """Shared back half: turn a network response into what the client sees."""
+        if entry is not None and response.status_code == 304:
+            self.revalidated += 1
+            return self.refresh(key, entry).to_response(request, "REVALIDATED")
+        self.misses += 1
+        return self.store_response(key, response, body).to_response(request, "MISS")
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.entry"
+
+    def _files(self) -> list[Path]:
+        return list(self.directory.glob("*.entry"))
+
+    def _remove(self, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return
+        self._size -= size
+
+
+class CachingTransport(httpx.BaseTransport):
+    def __init__(self, cache: ResponseCache, transport: httpx.BaseTransport | None = None):
+        self.cache = cache
+        self.transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return self.transport.handle_request(request)
+        key, entry, cached = self.cache.lookup(request)
+        if cached is not None:
+            return cached
+        response = self.transport.handle_request(request)
+        try:
+            body = response.read()
+        finally:
+            response.close()
+        return self.cache.complete(key, entry, request, response, body)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncCachingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, cache: ResponseCache, transport: httpx.AsyncBaseTransport | None = None):
+        self.cache = cache
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return await self.transport.handle_async_request(request)
+        key, entry, cached = self.cache.lookup(request)
+        if cached is not None:
+            return cached
+        response = await self.transport.handle_async_request(request)
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        return self.cache.complete(key, entry, request, response, body)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -1,91 +1,158 @@
 import logging
+import uuid
 from collections.abc import Iterator
 
-from sqlalchemy import select
+from sqlalchemy import Boolean, func, insert, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.models.organization import Organization
 from app.models.grant import Grant
+from app.services.giving import GrantFigures, apply_giving_deltas
+from app.services.response_cache import response_cache
 from indexer.base import RawGrant, RawOrganization, RawRecord
+from indexer.checkpoint import save_checkpoint
+from indexer.resolver import OrgIdResolver, OrgKey
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT ... ON CONFLICT statement. Keeps statement size bounded when
+# a connector hands us a very large RawRecord.
+UPSERT_CHUNK_SIZE = 1000
 
-def load_records(session: Session, records: Iterator[RawRecord]) -> dict[str, int]:
+
+def load_records(
+    session: Session,
+    records: Iterator[RawRecord],
+    resolver: OrgIdResolver | None = None,
+    checkpoint_key: str | None = None,
+) -> dict[str, int]:
     """Load raw records into the database, upserting organizations and inserting grants.
 
+    Organizations in each record are written with set-based upserts rather than
+    one SELECT per row, and grant endpoints are resolved through ``resolver``
+    so each batch costs a constant number of queries. Each batch's grants are
+    added to the giving summaries in the same transaction, and cached API
+    responses are invalidated once it commits. When
+    ``checkpoint_key`` is set, each record's checkpoint is committed together
+    with its data.
     Returns counts of created/updated entities.
     """
     stats = {"orgs_created": 0, "orgs_updated": 0, "grants_created": 0}
+    resolver = resolver or OrgIdResolver()
 
     for record in records:
-        for raw_org in record.organizations:
-            _upsert_org(session, raw_org, stats)
-        for raw_grant in record.grants:
-            _insert_grant(session, raw_grant, stats)
+        resolver.remember(_upsert_orgs(session, record.organizations, stats))
+        inserted = _insert_grants(session, record.grants, resolver, stats)
+        apply_giving_deltas(session, inserted)
+        if checkpoint_key and record.checkpoint is not None:
+            save_checkpoint(session, checkpoint_key, record.checkpoint)
         session.commit()
+        if record.organizations:
+            response_cache.invalidate("organizations")
+        if inserted:
+            response_cache.invalidate("grants")
+
+    logger.debug("Org id resolver: %d hits, %d misses", resolver.hits, resolver.misses)
 
     return stats
 
 
-def _upsert_org(session: Session, raw: RawOrganization, stats: dict[str, int]) -> Organization:
-    stmt = select(Organization).where(
-        Organization.registry == raw.registry,
-        Organization.external_id == raw.external_id,
-    )
-    existing = session.execute(stmt).scalar_one_or_none()
-    if existing:
-        existing.name = raw.name
-        existing.country = raw.country or existing.country
-        existing.website = raw.website or existing.website
-        existing.city = raw.city or existing.city
-        existing.region = raw.region or existing.region
-        stats["orgs_updated"] += 1
-        return existing
-    else:
-        org = Organization(
-            name=raw.name,
-            registry=raw.registry,
-            external_id=raw.external_id,
-            country=raw.country,
-            website=raw.website,
-            city=raw.city,
-            region=raw.region,
-        )
-        session.add(org)
-        session.flush()
-        stats["orgs_created"] += 1
-        return org
+def _upsert_orgs(
+    session: Session, raws: list[RawOrganization], stats: dict[str, int]
+) -> dict[OrgKey, uuid.UUID]:
+    """Upsert a batch of organizations and return their ids keyed by (registry, external_id).
 
+    Mirrors the row-by-row rules: ``name`` is always overwritten, the optional
+    fields keep their stored value when the incoming one is empty.
+    """
+    rows: dict[OrgKey, dict] = {}
+    for raw in raws:
+        key = (raw.registry, raw.external_id)
+        row = {
+            "name": raw.name,
+            "registry": raw.registry,
+            "external_id": raw.external_id,
+            "country": raw.country,
+            "website": raw.website,
+            "city": raw.city,
+            "region": raw.region,
+        }
+        previous = rows.get(key)
+        if previous is not None:
+            # Postgres refuses to touch the same row twice in one ON CONFLICT
+            # statement, so fold duplicates here the way sequential upserts would.
+            for field in ("country", "website", "city", "region"):
+                row[field] = row[field] or previous[field]
+            stats["orgs_updated"] += 1
+        rows[key] = row
 
-def _insert_grant(session: Session, raw: RawGrant, stats: dict[str, int]) -> None:
-    funder = session.execute(
-        select(Organization).where(
-            Organization.registry == raw.funder_registry,
-            Organization.external_id == raw.funder_external_id,
-        )
-    ).scalar_one_or_none()
-    grantee = session.execute(
-        select(Organization).where(
-            Organization.registry == raw.grantee_registry,
-            Organization.external_id == raw.grantee_external_id,
+    ids: dict[OrgKey, uuid.UUID] = {}
+    values = list(rows.values())
+    for start in range(0, len(values), UPSERT_CHUNK_SIZE):
+        stmt = pg_insert(Organization).values(values[start : start + UPSERT_CHUNK_SIZE])
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_org_registry_external_id",
+            set_={
+                "name": excluded.name,
+                "country": func.coalesce(func.nullif(excluded.country, ""), Organization.country),
+                "website": func.coalesce(func.nullif(excluded.website, ""), Organization.website),
+                "city": func.coalesce(func.nullif(excluded.city, ""), Organization.city),
+                "region": func.coalesce(func.nullif(excluded.region, ""), Organization.region),
+                "updated_at": func.now(),
+            },
+        ).returning(
+            Organization.id,
+            Organization.registry,
+            Organization.external_id,
+            # xmax is zero only for tuples created by this statement.
+            literal_column("(xmax = 0)", Boolean).label("inserted"),
         )
-    ).scalar_one_or_none()
+        for row in session.execute(stmt):
+            ids[(row.registry, row.external_id)] = row.id
+            if row.inserted:
+                stats["orgs_created"] += 1
+            else:
+                stats["orgs_updated"] += 1
 
-    if not funder or not grantee:
-        logger.warning(
-            "Skipping grant: funder=%s/%s grantee=%s/%s — org not found",
-            raw.funder_registry, raw.funder_external_id,
-            raw.grantee_registry, raw.grantee_external_id,
+    return ids
+
+
+def _insert_grants(
+    session: Session, raws: list[RawGrant], resolver: OrgIdResolver, stats: dict[str, int]
+) -> list[GrantFigures]:
+    """Insert a batch of grants and return the figures of those inserted."""
+    if not raws:
+        return []
+    keys: list[OrgKey] = []
+    for raw in raws:
+        keys.append((raw.funder_registry, raw.funder_external_id))
+        keys.append((raw.grantee_registry, raw.grantee_external_id))
+    ids = resolver.resolve(session, keys)
+
+    rows = []
+    for raw in raws:
+        funder_id = ids.get((raw.funder_registry, raw.funder_external_id))
+        grantee_id = ids.get((raw.grantee_registry, raw.grantee_external_id))
+        if not funder_id or not grantee_id:
+            logger.warning(
+                "Skipping grant: funder=%s/%s grantee=%s/%s — org not found",
+                raw.funder_registry, raw.funder_external_id,
+                raw.grantee_registry, raw.grantee_external_id,
+            )
+            continue
+        rows.append(
+            {
+                "funder_org_id": funder_id,
+                "grantee_org_id": grantee_id,
+                "amount": raw.amount,
+                "year": raw.year,
+                "source": raw.source,
+            }
         )
-        return
-
-    grant = Grant(
-        funder_org_id=funder.id,
-        grantee_org_id=grantee.id,
-        amount=raw.amount,
-        year=raw.year,
-        source=raw.source,
-    )
-    session.add(grant)
-    stats["grants_created"] += 1
+
+    if rows:
+        session.execute(insert(Grant), rows)
+        stats["grants_created"] += len(rows)
+    return [(row["funder_org_id"], row["grantee_org_id"], row["amount"], row["year"]) for row in rows]
@@ -0,0 +1,189 @@
+"""Pipelined indexer execution.
+
+Fetching, parsing and loading run as separate stages connected by bounded
+queues: a fetch thread pulls payloads from ``connector.fetch_raw()``, a parse
+thread turns them into RawRecords with ``connector.parse()``, and the loader
+consumes them on the calling thread. A full queue blocks the stage feeding
+it, so a fast producer never buffers more than ``queue_size`` items ahead.
+
+Per-stage stats are logged periodically. A stage that is mostly *blocked* is
+waiting on the stage after it; one that mostly *waits* is starved by the stage
+before it. A high ``blocked`` on fetch means Postgres is the bottleneck, and a
+high ``wait`` on load means the network is.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from indexer.base import BaseConnector, RawRecord
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    name: str
+    items: int = 0
+    busy: float = 0.0
+    wait: float = 0.0
+    blocked: float = 0.0
+
+    def summary(self, elapsed: float) -> str:
+        rate = self.items / elapsed if elapsed else 0.0
+        return (
+            f"{self.name} {self.items} ({rate:.1f}/s, busy {self.busy:.1f}s, "
+            f"wait {self.wait:.1f}s, blocked {self.blocked:.1f}s)"
+        )
+
+
+class Pipeline:
+    def __init__(
+        self,
+        connector: BaseConnector,
+        queue_size: int = 8,
+        log_interval: float = 10.0,
+    ):
+        self.connector = connector
+        self.log_interval = log_interval
+        self.raw: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.parsed: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.fetch_stats = StageStats("fetch")
+        self.parse_stats = StageStats("parse")
+        self.load_stats = StageStats("load")
+        self.peak_depth = {"raw": 0, "parsed": 0}
+        self._stop = threading.Event()
+        self._errors: list[BaseException] = []
+        self._started = 0.0
+
+    def run(self, load: Callable[[Iterator[RawRecord]], dict[str, int]]) -> dict[str, int]:
+        """Run the pipeline, handing the parsed record stream to ``load``."""
+        self._started = time.perf_counter()
+        threads = [
+            threading.Thread(target=self._fetch_stage, name="indexer-fetch", daemon=True),
+            threading.Thread(target=self._parse_stage, name="indexer-parse", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            stats = load(self._records())
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+            self._log("Pipeline finished")
+        if self._errors:
+            raise self._errors[0]
+        return stats
+
+    def _fetch_stage(self) -> None:
+        payloads: Iterator[Any] | None = None
+        try:
+            payloads = iter(self.connector.fetch_raw())
+            while not self._stop.is_set():
+                started = time.perf_counter()
+                try:
+                    payload = next(payloads)
+                except StopIteration:
+                    break
+                finally:
+                    self.fetch_stats.busy += time.perf_counter() - started
+                self.fetch_stats.items += 1
+                self._put(self.raw, "raw", payload, self.fetch_stats)
+        except BaseException as exc:
+            self._errors.append(exc)
+            self._stop.set()
+        finally:
+            close = getattr(payloads, "close", None)
+            if close is not None:
+                close()
+            self._put(self.raw, "raw", _DONE, self.fetch_stats)
+
+    def _parse_stage(self) -> None:
+        try:
+            while (payload := self._get(self.raw, self.parse_stats)) is not _DONE:
+                started = time.perf_counter()
+                record = self.connector.parse(payload)
+                self.parse_stats.busy += time.perf_counter() - started
+                self.parse_stats.items += 1
+                self._put(self.parsed, "parsed", record, self.parse_stats)
+        except BaseException as exc:
+            self._errors.append(exc)
+            self._stop.set()
+        finally:
+            self._put(self.parsed, "parsed", _DONE, self.parse_stats)
+
+    def _records(self) -> Iterator[RawRecord]:
+        last_log = time.perf_counter()
+        returned = last_log
+        while True:
+            # Time between handing out a record and asking for the next one is load work.
+            self.load_stats.busy += time.perf_counter() - returned
+            record = self._get(self.parsed, self.load_stats)
+            if record is _DONE:
+                # A stage failure must fail the load too, so its transaction rolls back
+                # instead of committing a truncated stream.
+                if self._errors:
+                    raise self._errors[0]
+                return
+            self.load_stats.items += 1
+            now = time.perf_counter()
+            if now - last_log >= self.log_interval:
+                self._log("Pipeline progress")
+                last_log = now
+            returned = time.perf_counter()
+            yield record
+
+    def _put(self, q: queue.Queue, name: str, item: Any, stats: StageStats) -> None:
+        started = time.perf_counter()
+        while True:
+            try:
+                q.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                if self._stop.is_set() and item is not _DONE:
+                    break
+                if self._stop.is_set():
+                    # Downstream is gone; drop one stale item to make room for the sentinel.
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+        stats.blocked += time.perf_counter() - started
+        self.peak_depth[name] = max(self.peak_depth[name], q.qsize())
+
+    def _get(self, q: queue.Queue, stats: StageStats) -> Any:
+        # Every producer ends with _DONE, even on error or stop, so this cannot hang.
+        started = time.perf_counter()
+        item = q.get()
+        stats.wait += time.perf_counter() - started
+        return item
+
+    def _log(self, message: str) -> None:
+        elapsed = time.perf_counter() - self._started
+        logger.info(
+            "%s after %.1fs: %s | raw queue %d/%d (peak %d) | %s | parsed queue %d/%d (peak %d) | %s",
+            message,
+            elapsed,
+            self.fetch_stats.summary(elapsed),
+            self.raw.qsize(), self.raw.maxsize, self.peak_depth["raw"],
+            self.parse_stats.summary(elapsed),
+            self.parsed.qsize(), self.parsed.maxsize, self.peak_depth["parsed"],
+            self.load_stats.summary(elapsed),
+        )
+
+
+def run_pipeline(
+    connector: BaseConnector,
+    load: Callable[[Iterator[RawRecord]], dict[str, int]],
+    queue_size: int = 8,
+    log_interval: float = 10.0,
+) -> dict[str, int]:
+    """Fetch, parse and load ``connector`` output concurrently; returns ``load``'s stats."""
+    return Pipeline(connector, queue_size=queue_size, log_interval=log_interval).run(load)
@@ -0,0 +1,71 @@
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.organization import Organization
+
+OrgKey = tuple[str, str]
+
+# Keys per (registry, external_id) IN (...) lookup.
+PREFETCH_CHUNK_SIZE = 1000
+
+
+class OrgIdResolver:
+    """Resolve (registry, external_id) pairs to organization ids.
+
+    Keeps a bounded LRU of known mappings across batches so recurring funders
+    are looked up once per run, and fetches all misses for a batch in a single
+    query per chunk instead of one query per grant.
+    """
+
+    def __init__(self, max_size: int = 100_000):
+        self.max_size = max_size
+        self._cache: OrderedDict[OrgKey, uuid.UUID] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def remember(self, mapping: dict[OrgKey, uuid.UUID]) -> None:
+        """Record known ids, e.g. those returned by the organization upsert."""
+        for key, org_id in mapping.items():
+            self._put(key, org_id)
+
+    def resolve(self, session: Session, keys: Iterable[OrgKey]) -> dict[OrgKey, uuid.UUID]:
+        """Return ids for every key that exists, querying only for cache misses.
+
+        The result is independent of the LRU size, so a batch with more distinct
+        keys than ``max_size`` still resolves completely.
+        """
+        found: dict[OrgKey, uuid.UUID] = {}
+        missing: list[OrgKey] = []
+        for key in dict.fromkeys(keys):
+            org_id = self._cache.get(key)
+            if org_id is None:
+                missing.append(key)
+            else:
+                self._cache.move_to_end(key)
+                found[key] = org_id
+        self.hits += len(found)
+        self.misses += len(missing)
+
+        for start in range(0, len(missing), PREFETCH_CHUNK_SIZE):
+            chunk = missing[start : start + PREFETCH_CHUNK_SIZE]
+            stmt = select(Organization.registry, Organization.external_id, Organization.id).where(
+                tuple_(Organization.registry, Organization.external_id).in_(chunk)
+            )
+            for registry, external_id, org_id in session.execute(stmt):
+                found[(registry, external_id)] = org_id
+                self._put((registry, external_id), org_id)
+
+        return found
+
+    def _put(self, key: OrgKey, org_id: uuid.UUID) -> None:
+        self._cache[key] = org_id
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
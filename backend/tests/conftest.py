@@ -0,0 +1,21 @@
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+
+
+@pytest.fixture(scope="session")
+def sync_engine() -> Iterator[Engine]:
+    """An engine on ``DATABASE_URL_SYNC``; tests using it are skipped when the database is unreachable."""
+    engine = create_engine(settings.database_url_sync, connect_args={"connect_timeout": 3})
+    try:
+        with engine.connect():
+            pass
+    except OperationalError as exc:
+        engine.dispose()
+        pytest.skip(f"No database at DATABASE_URL_SYNC: {exc.orig}")
+    yield engine
+    engine.dispose()
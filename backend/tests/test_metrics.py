@@ -0,0 +1,28 @@
+import asyncio
+
+import pytest
+
+from app.metrics import Counter, RequestStats, _Metric, _request_stats, background_context
+
+
+def test_metric_requires_samples():
+    class Untyped(_Metric):
+        kind = "untyped"
+
+    with pytest.raises(TypeError):
+        Untyped("untyped", "No samples.")
+    assert list(Counter("things_total", "Things.").render())[-1] == "# TYPE things_total counter"
+
+
+async def test_background_tasks_are_not_charged_to_the_request():
+    async def current() -> RequestStats | None:
+        return _request_stats.get()
+
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    try:
+        assert await asyncio.create_task(current()) is stats
+        assert await asyncio.create_task(current(), context=background_context()) is None
+        assert _request_stats.get() is stats
+    finally:
+        _request_stats.reset(token)
@@ -0,0 +1,60 @@
+import base64
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException, Response
+
+from app.api.funnel import funnel_keyset
+from app.api.organizations import org_keyset
+
+
+def _cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).rstrip(b"=").decode()
+
+
+def _next_cursor(keyset, row) -> str:
+    response = Response()
+    keyset.page([row, row], 1, response)
+    return response.headers["X-Next-Cursor"]
+
+
+class _Row:
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+
+def test_cursor_round_trip():
+    org_id = uuid.uuid4()
+    cursor = _next_cursor(org_keyset, _Row(name="Acme", id=org_id))
+    assert org_keyset._decode(cursor) == ("Acme", org_id)
+
+    updated_at = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    cursor = _next_cursor(funnel_keyset, _Row(updated_at=updated_at, id=org_id))
+    assert funnel_keyset._decode(cursor) == (updated_at, org_id)
+
+
+@pytest.mark.parametrize(
+    ("keyset", "value"),
+    [
+        (org_keyset, [42, str(uuid.uuid4())]),
+        (org_keyset, [["a"], str(uuid.uuid4())]),
+        (org_keyset, [True, str(uuid.uuid4())]),
+        (org_keyset, ["Acme", 42]),
+        (org_keyset, ["Acme", "not-a-uuid"]),
+        (org_keyset, ["Acme"]),
+        (funnel_keyset, [42, str(uuid.uuid4())]),
+        (funnel_keyset, ["yesterday", str(uuid.uuid4())]),
+    ],
+)
+def test_malformed_cursor_is_rejected(keyset, value):
+    with pytest.raises(HTTPException) as excinfo:
+        keyset._decode(_cursor(value))
+    assert excinfo.value.status_code == 400
+
+
+def test_undecodable_cursor_is_rejected():
+    with pytest.raises(HTTPException) as excinfo:
+        org_keyset._decode("!!!")
+    assert excinfo.value.status_code == 400
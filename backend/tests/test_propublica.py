@@ -0,0 +1,115 @@
+import asyncio
+import re
+
+import httpx
+import pytest
+
+from indexer.connectors.propublica import AsyncProPublicaConnector
+
+EINS = [f"{n:09d}" for n in range(1, 11)]
+
+
+def _org(ein: str) -> httpx.Response:
+    return httpx.Response(200, json={"organization": {"ein": int(ein), "name": f"Org {ein}"}})
+
+
+def _ein(request: httpx.Request) -> str:
+    return re.search(r"/organizations/(\d+)\.json$", request.url.path).group(1)
+
+
+def _connector(handler, **kwargs) -> AsyncProPublicaConnector:
+    kwargs.setdefault("rate", 1000.0)
+    return AsyncProPublicaConnector(transport=httpx.MockTransport(handler), **kwargs)
+
+
+async def _collect(connector: AsyncProPublicaConnector) -> list[tuple[int, list[dict]]]:
+    return [payload async for payload in connector.afetch_raw()]
+
+
+async def test_retries_429_and_5xx():
+    statuses = {"000000001": [429, 503, 502], "000000002": [500]}
+    calls: dict[str, int] = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        ein = _ein(request)
+        calls[ein] = calls.get(ein, 0) + 1
+        pending = statuses.get(ein)
+        if pending:
+            return httpx.Response(pending.pop(0), headers={"Retry-After": "0"})
+        return _org(ein)
+
+    payloads = await _collect(_connector(handler, ein_list=EINS[:3]))
+
+    assert calls == {"000000001": 4, "000000002": 2, "000000003": 1}
+    assert sorted(org["ein"] for _, orgs in payloads for org in orgs) == [1, 2, 3]
+    assert max(checkpoint for checkpoint, _ in payloads) == 3
+
+
+async def test_checkpoint_stops_at_first_failure():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        ein = _ein(request)
+        if ein == EINS[1]:
+            # Fails after every other EIN has completed.
+            await asyncio.sleep(0.05)
+            return httpx.Response(500, headers={"Retry-After": "0"})
+        return _org(ein)
+
+    connector = _connector(handler, ein_list=EINS[:5], concurrency=5)
+    payloads = []
+    with pytest.raises(httpx.HTTPStatusError):
+        async for payload in connector.afetch_raw():
+            payloads.append(payload)
+
+    # EINs 0, 2, 3 and 4 were delivered, but only EIN 0 is below the failed one.
+    assert sorted(org["ein"] for _, orgs in payloads for org in orgs) == [1, 3, 4, 5]
+    assert max(checkpoint for checkpoint, _ in payloads) == 1
+
+
+async def test_resume_starts_at_checkpoint():
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(_ein(request))
+        return _org(_ein(request))
+
+    connector = _connector(handler, ein_list=EINS[:5])
+    connector.start_position = 1
+    payloads = await _collect(connector)
+
+    assert sorted(requested) == EINS[1:5]
+    assert max(checkpoint for checkpoint, _ in payloads) == 5
+
+
+async def test_concurrency_limit():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _org(_ein(request))
+
+    payloads = await _collect(_connector(handler, ein_list=EINS, concurrency=3))
+
+    assert peak == 3
+    assert len(payloads) == len(EINS)
+
+
+async def test_search_stops_at_first_empty_page():
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        orgs = [{"ein": page, "name": f"Org {page}"}] if page < 3 else []
+        return httpx.Response(200, json={"organizations": orgs})
+
+    payloads = await _collect(_connector(handler, search_query="foundation", max_pages=6, concurrency=2))
+
+    assert sorted(orgs[0]["ein"] for _, orgs in payloads) == [0, 1, 2]
+
+
+def test_fetch_raw_bridges_to_sync_consumers():
+    payloads = list(_connector(lambda request: _org(_ein(request)), ein_list=EINS[:4]).fetch_raw())
+
+    assert sorted(org["ein"] for _, orgs in payloads for org in orgs) == [1, 2, 3, 4]
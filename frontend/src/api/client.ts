@@ -1,9 +1,14 @@
 import type {
   Organization,
+  OrganizationSearchResult,
+  OrganizationSimilarity,
   Grant,
   Tenant,
   FunnelEntry,
   FunnelStatus,
+  FunnelSummary,
+  GivingSummary,
+  Recommendation,
 } from "../types";
 
 const BASE = "/api";
@@ -34,13 +39,55 @@ export function listOrganizations(params?: {
   return request(`/organizations?${sp}`);
 }
 
+export function searchOrganizations(params: {
+  q: string;
+  offset?: number;
+  limit?: number;
+}): Promise<OrganizationSearchResult[]> {
+  const sp = new URLSearchParams({ q: params.q });
+  if (params.offset) sp.set("offset", String(params.offset));
+  if (params.limit) sp.set("limit", String(params.limit));
+  return request(`/organizations/search?${sp}`);
+}
+
 export function getOrganization(id: string): Promise<Organization> {
   return request(`/organizations/${id}`);
 }
 
-export function countOrganizations(q?: string): Promise<{ count: number }> {
+export function getGivingSummary(id: string): Promise<GivingSummary> {
+  return request(`/organizations/${id}/giving-summary`);
+}
+
+export function getSimilarGrantees(
+  id: string,
+  limit = 10
+): Promise<OrganizationSimilarity[]> {
+  return request(`/organizations/${id}/similar-grantees?limit=${limit}`);
+}
+
+export function getSimilarFunders(
+  id: string,
+  limit = 10
+): Promise<OrganizationSimilarity[]> {
+  return request(`/organizations/${id}/similar-funders?limit=${limit}`);
+}
+
+export function batchGetOrganizations(
+  ids: string[]
+): Promise<{ organizations: (Organization | null)[]; missing: string[] }> {
+  return request(`/organizations/batch-get`, {
+    method: "POST",
+    body: JSON.stringify({ ids }),
+  });
+}
+
+export function countOrganizations(
+  q?: string,
+  exact = false,
+): Promise<{ count: number; exact: boolean }> {
   const sp = new URLSearchParams();
   if (q) sp.set("q", q);
+  if (exact) sp.set("exact", "true");
   return request(`/organizations/count?${sp}`);
 }
 
@@ -74,16 +121,29 @@ export function createTenant(data: {
   });
 }
 
+export function getRecommendations(
+  tenantId: string,
+  limit = 10
+): Promise<Recommendation[]> {
+  return request(`/tenants/${tenantId}/recommendations?limit=${limit}`);
+}
+
 // Funnel
 export function listFunnelEntries(
   tenantId: string,
-  status?: FunnelStatus
+  status?: FunnelStatus,
+  expand?: "organization"
 ): Promise<FunnelEntry[]> {
   const sp = new URLSearchParams();
   if (status) sp.set("status", status);
+  if (expand) sp.set("expand", expand);
   return request(`/tenants/${tenantId}/funnel?${sp}`);
 }
 
+export function getFunnelSummary(tenantId: string): Promise<FunnelSummary> {
+  return request(`/tenants/${tenantId}/funnel/summary`);
+}
+
 export function createFunnelEntry(
   tenantId: string,
   data: { org_id: string; status?: FunnelStatus }
@@ -96,9 +156,14 @@ export function createFunnelEntry(
 
 export function bulkCreateFunnelEntries(
   tenantId: string,
-  entries: { org_id: string; status?: FunnelStatus }[]
-): Promise<FunnelEntry[]> {
-  return request(`/tenants/${tenantId}/funnel/bulk`, {
+  entries: { org_id: string; status?: FunnelStatus }[],
+  onConflict: "skip" | "update" = "skip"
+): Promise<{
+  created: FunnelEntry[];
+  updated: FunnelEntry[];
+  skipped: string[];
+}> {
+  return request(`/tenants/${tenantId}/funnel/bulk?on_conflict=${onConflict}`, {
     method: "POST",
     body: JSON.stringify(entries),
   });
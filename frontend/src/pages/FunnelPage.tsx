@@ -2,38 +2,43 @@ import { useEffect, useState, useCallback } from "react";
 import { useParams, Link } from "react-router-dom";
 import {
   listFunnelEntries,
+  getFunnelSummary,
   listOrganizations,
   createFunnelEntry,
   updateFunnelEntry,
   deleteFunnelEntry,
+  getRecommendations,
 } from "../api/client";
-import type { FunnelEntry, Organization, FunnelStatus } from "../types";
+import type {
+  FunnelEntry,
+  FunnelSummary,
+  Organization,
+  FunnelStatus,
+  Recommendation,
+} from "../types";
 import { FUNNEL_STATUSES, STATUS_LABELS } from "../types";
 
 export default function FunnelPage() {
   const { tenantId } = useParams<{ tenantId: string }>();
   const [entries, setEntries] = useState<FunnelEntry[]>([]);
   const [orgMap, setOrgMap] = useState<Record<string, Organization>>({});
+  const [summary, setSummary] = useState<FunnelSummary | null>(null);
   const [showAdd, setShowAdd] = useState(false);
   const [searchQuery, setSearchQuery] = useState("");
   const [searchResults, setSearchResults] = useState<Organization[]>([]);
+  const [recommended, setRecommended] = useState<Recommendation[]>([]);
 
   const loadEntries = useCallback(async () => {
     if (!tenantId) return;
-    const data = await listFunnelEntries(tenantId);
+    const [data, counts] = await Promise.all([
+      listFunnelEntries(tenantId, undefined, "organization"),
+      getFunnelSummary(tenantId),
+    ]);
     setEntries(data);
-    // Fetch org details for each entry
-    const orgIds = [...new Set(data.map((e) => e.org_id))];
-    const orgs = await Promise.all(
-      orgIds.map((id) =>
-        fetch(`/api/organizations/${id}`)
-          .then((r) => r.json())
-          .catch(() => null)
-      )
-    );
+    setSummary(counts);
     const map: Record<string, Organization> = {};
-    for (const org of orgs) {
-      if (org) map[org.id] = org;
+    for (const entry of data) {
+      if (entry.organization) map[entry.org_id] = entry.organization;
     }
     setOrgMap(map);
   }, [tenantId]);
@@ -57,6 +62,12 @@ export default function FunnelPage() {
     loadEntries();
   };
 
+  const openAdd = async () => {
+    if (!tenantId) return;
+    setShowAdd(true);
+    setRecommended(await getRecommendations(tenantId));
+  };
+
   const handleSearch = async () => {
     if (!searchQuery.trim()) return;
     const results = await listOrganizations({ q: searchQuery });
@@ -84,7 +95,7 @@ export default function FunnelPage() {
     <div>
       <div className="page-header">
         <h2>Funnel</h2>
-        <button className="primary" onClick={() => setShowAdd(true)}>
+        <button className="primary" onClick={openAdd}>
           Add Organization
         </button>
       </div>
@@ -94,7 +105,9 @@ export default function FunnelPage() {
           <div className="kanban-column" key={status}>
             <h3>
               {STATUS_LABELS[status]}{" "}
-              <span className="count">{grouped[status].length}</span>
+              <span className="count">
+                {summary?.counts[status] ?? grouped[status].length}
+              </span>
             </h3>
             {grouped[status].map((entry) => {
               const org = orgMap[entry.org_id];
@@ -194,6 +207,40 @@ export default function FunnelPage() {
                 </tbody>
               </table>
             )}
+            {searchResults.length === 0 && recommended.length > 0 && (
+              <>
+                <h4 style={{ margin: "1rem 0 0.5rem" }}>Recommended</h4>
+                <table>
+                  <thead>
+                    <tr>
+                      <th>Name</th>
+                      <th>Location</th>
+                      <th>Score</th>
+                      <th></th>
+                    </tr>
+                  </thead>
+                  <tbody>
+                    {recommended.map((org) => (
+                      <tr key={org.id}>
+                        <td>{org.name}</td>
+                        <td>
+                          {[org.city, org.region].filter(Boolean).join(", ")}
+                        </td>
+                        <td>{org.score.toFixed(2)}</td>
+                        <td>
+                          <button
+                            className="primary"
+                            onClick={() => handleAddToFunnel(org.id)}
+                          >
+                            Add
+                          </button>
+                        </td>
+                      </tr>
+                    ))}
+                  </tbody>
+                </table>
+              </>
+            )}
             <div className="form-actions">
               <button onClick={() => setShowAdd(false)}>Cancel</button>
             </div>
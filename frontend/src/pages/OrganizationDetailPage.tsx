@@ -1,19 +1,59 @@
 import { useEffect, useState } from "react";
 import { useParams, Link } from "react-router-dom";
-import { getOrganization, listGrants } from "../api/client";
-import type { Organization, Grant } from "../types";
+import {
+  batchGetOrganizations,
+  getGivingSummary,
+  getOrganization,
+  getSimilarFunders,
+  getSimilarGrantees,
+  listGrants,
+} from "../api/client";
+import type {
+  Organization,
+  Grant,
+  GivingSummary,
+  OrganizationSimilarity,
+} from "../types";
+
+const money = (amount: string) => `$${Number(amount).toLocaleString()}`;
 
 export default function OrganizationDetailPage() {
   const { orgId } = useParams<{ orgId: string }>();
   const [org, setOrg] = useState<Organization | null>(null);
   const [grantsGiven, setGrantsGiven] = useState<Grant[]>([]);
   const [grantsReceived, setGrantsReceived] = useState<Grant[]>([]);
+  const [names, setNames] = useState<Record<string, string>>({});
+  const [giving, setGiving] = useState<GivingSummary | null>(null);
+  const [similarGrantees, setSimilarGrantees] = useState<OrganizationSimilarity[]>([]);
+  const [similarFunders, setSimilarFunders] = useState<OrganizationSimilarity[]>([]);
 
   useEffect(() => {
     if (!orgId) return;
     getOrganization(orgId).then(setOrg);
-    listGrants({ funder_org_id: orgId }).then(setGrantsGiven);
-    listGrants({ grantee_org_id: orgId }).then(setGrantsReceived);
+    getGivingSummary(orgId).then(setGiving);
+    getSimilarGrantees(orgId).then(setSimilarGrantees);
+    getSimilarFunders(orgId).then(setSimilarFunders);
+    Promise.all([
+      listGrants({ funder_org_id: orgId }),
+      listGrants({ grantee_org_id: orgId }),
+    ]).then(async ([given, received]) => {
+      setGrantsGiven(given);
+      setGrantsReceived(received);
+      // Resolve counterpart names in one request rather than one per grant.
+      const ids = [
+        ...new Set([
+          ...given.map((g) => g.grantee_org_id),
+          ...received.map((g) => g.funder_org_id),
+        ]),
+      ];
+      if (ids.length === 0) return;
+      const { organizations } = await batchGetOrganizations(ids);
+      const map: Record<string, string> = {};
+      for (const o of organizations) {
+        if (o) map[o.id] = o.name;
+      }
+      setNames(map);
+    });
   }, [orgId]);
 
   if (!org) return <p>Loading...</p>;
@@ -43,6 +83,79 @@ export default function OrganizationDetailPage() {
         )}
       </div>
 
+      {giving && (giving.total.given_count > 0 || giving.total.received_count > 0) && (
+        <>
+          <h3 style={{ margin: "1.5rem 0 0.75rem" }}>Giving Summary</h3>
+          <div className="card">
+            <p>
+              <strong>Given:</strong> {money(giving.total.given_amount)} in{" "}
+              {giving.total.given_count} grants to {giving.total.grantees}{" "}
+              grantees &mdash; <strong>Received:</strong>{" "}
+              {money(giving.total.received_amount)} in{" "}
+              {giving.total.received_count} grants from {giving.total.funders}{" "}
+              funders
+            </p>
+            {giving.by_year.length > 0 && (
+              <table>
+                <thead>
+                  <tr>
+                    <th>Year</th>
+                    <th>Given</th>
+                    <th>Grants</th>
+                    <th>Received</th>
+                    <th>Grants</th>
+                  </tr>
+                </thead>
+                <tbody>
+                  {giving.by_year.map((y) => (
+                    <tr key={y.year}>
+                      <td>{y.year}</td>
+                      <td>{money(y.given_amount)}</td>
+                      <td>{y.given_count}</td>
+                      <td>{money(y.received_amount)}</td>
+                      <td>{y.received_count}</td>
+                    </tr>
+                  ))}
+                </tbody>
+              </table>
+            )}
+          </div>
+        </>
+      )}
+
+      {[
+        { title: "Similar Grantees", orgs: similarGrantees },
+        { title: "Similar Funders", orgs: similarFunders },
+      ]
+        .filter(({ orgs }) => orgs.length > 0)
+        .map(({ title, orgs }) => (
+          <div key={title}>
+            <h3 style={{ margin: "1.5rem 0 0.75rem" }}>{title}</h3>
+            <div className="card">
+              <table>
+                <thead>
+                  <tr>
+                    <th>Organization</th>
+                    <th>Country</th>
+                    <th>Score</th>
+                  </tr>
+                </thead>
+                <tbody>
+                  {orgs.map((o) => (
+                    <tr key={o.id}>
+                      <td>
+                        <Link to={`/organizations/${o.id}`}>{o.name}</Link>
+                      </td>
+                      <td>{o.country ?? "N/A"}</td>
+                      <td>{o.score.toFixed(2)}</td>
+                    </tr>
+                  ))}
+                </tbody>
+              </table>
+            </div>
+          </div>
+        ))}
+
       <h3 style={{ margin: "1.5rem 0 0.75rem" }}>
         Grants Given ({grantsGiven.length})
       </h3>
@@ -62,7 +175,7 @@ export default function OrganizationDetailPage() {
                 <tr key={g.id}>
                   <td>
                     <Link to={`/organizations/${g.grantee_org_id}`}>
-                      {g.grantee_org_id.slice(0, 8)}...
+                      {names[g.grantee_org_id] ?? `${g.grantee_org_id.slice(0, 8)}...`}
                     </Link>
                   </td>
                   <td>{g.amount ? `$${Number(g.amount).toLocaleString()}` : "N/A"}</td>
@@ -96,7 +209,7 @@ export default function OrganizationDetailPage() {
                 <tr key={g.id}>
                   <td>
                     <Link to={`/organizations/${g.funder_org_id}`}>
-                      {g.funder_org_id.slice(0, 8)}...
+                      {names[g.funder_org_id] ?? `${g.funder_org_id.slice(0, 8)}...`}
                     </Link>
                   </td>
                   <td>{g.amount ? `$${Number(g.amount).toLocaleString()}` : "N/A"}</td>
@@ -1,21 +1,28 @@
 import { useEffect, useState } from "react";
 import { Link } from "react-router-dom";
-import { listOrganizations, countOrganizations } from "../api/client";
+import {
+  listOrganizations,
+  searchOrganizations,
+  countOrganizations,
+} from "../api/client";
 import type { Organization } from "../types";
 
 export default function OrganizationsPage() {
   const [orgs, setOrgs] = useState<Organization[]>([]);
   const [query, setQuery] = useState("");
   const [total, setTotal] = useState(0);
+  const [totalExact, setTotalExact] = useState(true);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
     const q = query || undefined;
     setLoading(true);
-    Promise.all([listOrganizations({ q }), countOrganizations(q)]).then(
+    const list = q ? searchOrganizations({ q }) : listOrganizations();
+    Promise.all([list, countOrganizations(q)]).then(
       ([data, count]) => {
         setOrgs(data);
         setTotal(count.count);
+        setTotalExact(count.exact);
         setLoading(false);
       }
     );
@@ -25,7 +32,10 @@ export default function OrganizationsPage() {
     <div>
       <div className="page-header">
         <h2>Organizations</h2>
-        <span>{total.toLocaleString()} total</span>
+        <span>
+          {totalExact ? "" : "~"}
+          {total.toLocaleString()} total
+        </span>
       </div>
       <div className="search-bar">
         <input
@@ -11,6 +11,21 @@ export interface Organization {
   updated_at: string;
 }
 
+export interface OrganizationSearchResult extends Organization {
+  score: number;
+}
+
+export interface OrganizationSimilarity extends Organization {
+  score: number;
+}
+
+export interface Recommendation extends Organization {
+  score: number;
+  shared_funders: number;
+  geography: number;
+  grant_size: number;
+}
+
 export interface Grant {
   id: string;
   funder_org_id: string;
@@ -62,4 +77,25 @@ export interface FunnelEntry {
   status: FunnelStatus;
   created_at: string;
   updated_at: string;
+  organization?: Organization;
+}
+
+export interface GivingTotals {
+  given_amount: string;
+  given_count: number;
+  grantees: number;
+  received_amount: string;
+  received_count: number;
+  funders: number;
+}
+
+export interface GivingSummary {
+  org_id: string;
+  total: GivingTotals;
+  by_year: (GivingTotals & { year: number })[];
+}
+
+export interface FunnelSummary {
+  counts: Record<FunnelStatus, number>;
+  total: number;
 }
@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.models import Base, Organization, Grant, Tenant, FunnelEntry, FunnelStatus
+from app.services.giving import apply_giving_deltas
 
 
 def seed() -> None:
@@ -107,6 +108,7 @@ def seed() -> None:
         ]
         session.add_all(grants)
         session.flush()
+        apply_giving_deltas(session, [(g.funder_org_id, g.grantee_org_id, g.amount, g.year) for g in grants])
 
         # Sample tenant
         tenant = Tenant(name="Demo Foundation", slug="demo-foundation")